@@ -3,6 +3,7 @@
 import { useState, useEffect } from 'react';
 import { useParams } from 'next/navigation';
 import Image from 'next/image';
+import ProductImage from '@/components/ProductImage';
 import Link from 'next/link';
 import { FiStar, FiShoppingCart, FiHeart, FiTruck, FiShield, FiCheck } from 'react-icons/fi';
 import { products } from '@/lib/data';
@@ -115,10 +116,9 @@ export default function ProductPage() {
           {/* Images */}
           <div>
             <div className="relative aspect-square bg-white-cream rounded-xl sm:rounded-2xl overflow-hidden mb-3 sm:mb-4 shadow-lg">
-              <Image
+              <ProductImage
+                product={product}
                 src={images[selectedImage]}
-                alt={product.name}
-                fill
                 className="object-cover"
                 priority
                 sizes="(max-width: 1024px) 100vw, 50vw"
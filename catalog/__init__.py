@@ -0,0 +1,4 @@
+"""Pipeline de génération du catalogue utilisé par generate_products.py."""
+from .loaders import iter_categories, iter_rows
+
+__all__ = ['iter_categories', 'iter_rows']
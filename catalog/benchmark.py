@@ -0,0 +1,249 @@
+"""Banc d'essai du pipeline de génération sur des catalogues synthétiques.
+
+    python -m catalog.benchmark                      # 1k, 10k, 100k produits
+    python -m catalog.benchmark --sizes 1000,10000 --update-baseline
+
+Les catalogues reprennent la forme de catalog/products.jsonl : marques et
+sous-catégories tirées selon leur fréquence réelle par catégorie, noms
+accentués. Chaque taille tourne dans un processus neuf pour mesurer son pic
+de mémoire. Chaque étape est répétée et seul le meilleur temps est retenu.
+Les temps sont comparés à une référence JSON, relevée si la machine est plus
+lente que celle de la référence (boucle d'étalonnage fixe) ; le script échoue
+si une étape régresse au-delà du seuil.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from .images import ImageIndex
+from .indexes import ProductIndexBuilder
+from .loaders import iter_rows
+from .output import open_output, write_chunks
+from .recommendations import RecommendationBuilder
+from .search import SearchIndexBuilder
+from .text import image_slug
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_CATALOG = os.path.join(ROOT, 'catalog', 'products.jsonl')
+DEFAULT_BASELINE = os.path.join(ROOT, 'catalog', 'benchmark_baseline.json')
+DEFAULT_SIZES = (1000, 10000, 100000)
+STAGES = ('load', 'serialize', 'images', 'indexes', 'recommendations', 'write')
+
+# Une étape régresse si elle dépasse la référence (ramenée à la vitesse de la machine)
+# de plus de THRESHOLD et d'au moins MIN_DELTA secondes
+THRESHOLD = 0.5
+MIN_DELTA = 0.1
+REPEAT = 3
+CALIBRATION_ITEMS = 200000
+IMAGE_COVERAGE = 0.9
+
+ACCENTED_WORDS = ('Crème', 'Sérum', 'Éclat', 'Fraîcheur', 'Douceur', 'Brume', 'Énergie', 'Végétal',
+                  'Hydratée', 'Réparatrice', 'Lumière', 'Pêche', 'Évasion', 'Naïade', 'Crêpe')
+
+
+def synthesize(size, path, seed=0):
+    """Écrit un catalogue JSONL de `size` produits calqué sur les distributions du catalogue réel."""
+    rng = random.Random(seed)
+    by_category = {}
+    for row in iter_rows(SOURCE_CATALOG):
+        by_category.setdefault(row['category'], []).append(row)
+    categories = list(by_category)
+    words = sorted({w for rows in by_category.values() for row in rows for w in row['name'].split()})
+
+    with open(path, 'w', encoding='utf-8') as f:
+        per_category = -(-size // len(categories))
+        written = 0
+        for cat_slug in categories:
+            source = by_category[cat_slug]
+            for i in range(min(per_category, size - written)):
+                model = rng.choice(source)
+                name = ' '.join(rng.sample(words, 2) + [rng.choice(ACCENTED_WORDS), str(written + 1)])
+                row = {
+                    'category': cat_slug,
+                    'name': name,
+                    'brand': rng.choice(source)['brand'],
+                    'price': round(model['price'] * rng.uniform(0.7, 1.3), 2),
+                    'desc': rng.choice(source)['desc'],
+                    'sub': rng.choice(source)['sub'],
+                }
+                f.write(json.dumps(row, ensure_ascii=False) + '\n')
+                written += 1
+
+
+def _peak_rss_bytes():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def best_of(repeat, fn):
+    """Meilleur temps de `repeat` appels à fn() et résultat du dernier appel."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def calibrate(repeat=REPEAT):
+    """Durée d'une charge fixe (formatage, JSON, dictionnaires), proche de celle du pipeline."""
+    def workload():
+        table = {}
+        for i in range(CALIBRATION_ITEMS):
+            key = f'produit_{i % 997}'
+            table[key] = table.get(key, 0) + len(json.dumps({'id': i, 'name': key.upper()}))
+        return table
+    return best_of(repeat, workload)[0]
+
+
+def run_size(size, seed=0, repeat=REPEAT):
+    """Mesure chaque étape pour un catalogue de `size` produits (exécuté dans un processus dédié)."""
+    # Importé ici : le script est à la racine du dépôt, hors du paquet
+    sys.path.insert(0, ROOT)
+    from generate_products import is_best_seller, iter_ts_chunks
+
+    timings = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'products.jsonl')
+        synthesize(size, source, seed)
+
+        timings['load'], rows = best_of(repeat, lambda: list(iter_rows(source)))
+        timings['serialize'], serialized = best_of(
+            repeat, lambda: sum(len(chunk) for chunk in iter_ts_chunks(iter(rows))))
+
+        images_dir = os.path.join(tmp, 'images')
+        os.mkdir(images_dir)
+        rng = random.Random(seed)
+        for row in rows:
+            if rng.random() < IMAGE_COVERAGE:
+                open(os.path.join(images_dir, image_slug(f"{row['name']} {row['brand']}") + '.jpg'), 'wb').close()
+
+        def resolve_images():
+            index = ImageIndex(images_dir)
+            return sum(index.lookup(f"{row['name']} {row['brand']}")[0] is not None for row in rows)
+        timings['images'], resolved = best_of(repeat, resolve_images)
+
+        def build_indexes():
+            indexes, search = ProductIndexBuilder(), SearchIndexBuilder()
+            for product_id, row in enumerate(rows, 1):
+                for builder in (indexes, search):
+                    builder.add(product_id, row['category'], row, is_best_seller(product_id))
+            indexes.render_ts()
+            for _chunk in search.iter_ts_chunks():
+                pass
+        timings['indexes'], _ = best_of(repeat, build_indexes)
+
+        def build_recommendations():
+            builder = RecommendationBuilder()
+            for product_id, row in enumerate(rows, 1):
+                builder.add(product_id, row['category'], row, is_best_seller(product_id))
+            return builder.compute()
+        timings['recommendations'], _ = best_of(repeat, build_recommendations)
+        del rows
+
+        output = os.path.join(tmp, 'data.ts')
+
+        def write():
+            with open_output(output) as out:
+                write_chunks(iter_ts_chunks(iter_rows(source)), out)
+        timings['write'], _ = best_of(repeat, write)
+        output_bytes = os.path.getsize(output)
+
+    return {
+        'calibrationSeconds': round(calibrate(repeat), 4),
+        'stages': {stage: round(timings[stage], 4) for stage in STAGES},
+        'peakRssBytes': _peak_rss_bytes(),
+        'outputBytes': output_bytes,
+        'serializedChars': serialized,
+        'imagesResolved': resolved,
+    }
+
+
+def compare(results, baseline, threshold=THRESHOLD, min_delta=MIN_DELTA):
+    """Liste des régressions (taille, étape, référence, mesure) par rapport à la référence.
+
+    Les temps de référence sont d'abord multipliés par le rapport des étalonnages
+    (machine actuelle / machine de la référence) s'il dépasse 1 : l'étalonnage
+    est lui-même bruité, il ne sert qu'à éviter les faux positifs sur une
+    machine plus lente.
+    """
+    regressions = []
+    for size, result in results.items():
+        reference = baseline.get(size)
+        if reference is None:
+            continue
+        speed = 1.0
+        if reference.get('calibrationSeconds') and result.get('calibrationSeconds'):
+            speed = max(1.0, result['calibrationSeconds'] / reference['calibrationSeconds'])
+        for stage, seconds in result['stages'].items():
+            before = reference['stages'].get(stage)
+            if before is None:
+                continue
+            before = round(before * speed, 4)
+            if seconds > before * (1 + threshold) and seconds - before > min_delta:
+                regressions.append((size, stage, before, seconds))
+        for metric in ('peakRssBytes', 'outputBytes'):
+            before = reference.get(metric)
+            if before and result[metric] > before * (1 + threshold):
+                regressions.append((size, metric, before, result[metric]))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Banc d\'essai de generate_products.py sur des catalogues synthétiques.')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='tailles de catalogue, séparées par des virgules')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='fichier JSON de référence')
+    parser.add_argument('--update-baseline', action='store_true', help='remplace la référence par les mesures')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help='régression tolérée par étape, en fraction (0.25 = +25 %%)')
+    parser.add_argument('--repeat', type=int, default=REPEAT,
+                        help='répétitions par étape, le meilleur temps est retenu')
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+
+    results = {}
+    for size in sizes:
+        # Un processus neuf par taille : le pic RSS mesuré est celui de cette taille seule
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+            result = pool.submit(run_size, size, args.seed, args.repeat).result()
+        results[str(size)] = result
+        stages = '  '.join(f'{stage} {seconds:.3f}s' for stage, seconds in result['stages'].items())
+        print(f'{size:>7} produits  {stages}  RSS {result["peakRssBytes"] / 2**20:.1f} Mio  '
+              f'sortie {result["outputBytes"] / 2**20:.1f} Mio  étalonnage {result["calibrationSeconds"]:.3f}s')
+
+    if args.update_baseline:
+        with open_output(args.baseline) as out:
+            json.dump(results, out, indent=2, sort_keys=True)
+            out.write('\n')
+        print(f'référence mise à jour : {args.baseline}')
+        return 0
+
+    try:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f'pas de référence ({args.baseline}) : relancer avec --update-baseline', file=sys.stderr)
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for size, metric, before, after in regressions:
+        print(f'RÉGRESSION {size} produits, {metric} : {before} -> {after}', file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""Déclinaisons responsives des images produits (WebP/AVIF à largeurs fixes).
+
+Les fichiers générés sont rangés par empreinte du fichier source :
+`<cache>/<sha256[:16]>/<largeur>w-q<qualité>.<format>`. Une source inchangée
+retrouve donc ses déclinaisons sans rien recalculer, et un état
+(`.state.json`) mémorise taille, date et empreinte de chaque source pour ne
+pas même la relire. Pillow est requis pour cette étape ; il n'est importé
+qu'avec --derivatives (vérification des formats, encodage).
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .images import DEFAULT_IMAGES_DIR, ImageIndex, probe_image
+from .instrumentation import metrics
+from .output import write_chunks_if_changed
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(DEFAULT_IMAGES_DIR), 'image-derivatives')
+URL_PREFIX = '/image-derivatives'
+WIDTHS = (320, 640, 960, 1280)
+QUALITY = {'webp': 80, 'avif': 55}
+STATE_FILE = '.state.json'
+
+
+def supported_formats(requested):
+    """Formats demandés que Pillow sait encoder ici, et ceux qui sont ignorés."""
+    try:
+        from PIL import features
+    except ImportError:  # dépendance optionnelle
+        return [], list(requested)
+    ok = [fmt for fmt in requested if fmt in QUALITY and features.check(fmt)]
+    return ok, [fmt for fmt in requested if fmt not in ok]
+
+
+def target_widths(width):
+    """Largeurs à produire : celles de WIDTHS plus petites que l'original, plus l'original s'il est dans la plage."""
+    if not width:
+        return []
+    widths = [w for w in WIDTHS if w < width]
+    if width <= WIDTHS[-1]:
+        widths.append(width)
+    return widths
+
+
+def variant_name(width, fmt):
+    return f'{width}w-q{QUALITY[fmt]}.{fmt}'
+
+
+def build_variants(task):
+    """Crée les déclinaisons manquantes d'une source (exécuté dans un processus du pool).
+
+    Renvoie le nombre de fichiers encodés.
+    """
+    from PIL import Image
+
+    src_path, key_dir, widths, formats = task
+    os.makedirs(key_dir, exist_ok=True)
+    created = 0
+    source = None
+    try:
+        for fmt in formats:
+            for width in widths:
+                target = os.path.join(key_dir, variant_name(width, fmt))
+                if os.path.exists(target):
+                    continue
+                if source is None:
+                    source = Image.open(src_path)
+                    source.load()
+                    if source.mode not in ('RGB', 'RGBA'):
+                        source = source.convert('RGB')
+                height = max(1, round(source.height * width / source.width))
+                resized = source if width == source.width else source.resize((width, height), Image.LANCZOS)
+                tmp = f'{target}.{os.getpid()}.tmp'
+                resized.save(tmp, format=fmt.upper(), quality=QUALITY[fmt])
+                os.replace(tmp, target)
+                created += 1
+    finally:
+        if source is not None:
+            source.close()
+    return created
+
+
+class DerivativeStage:
+    """Prépare les déclinaisons de toutes les images avant l'émission et fournit les srcset par produit."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, images_dir=DEFAULT_IMAGES_DIR, formats=('webp',), jobs=None,
+                 index=None):
+        self.cache_dir = cache_dir
+        self.index = index if index is not None else ImageIndex(images_dir)
+        self.formats = list(formats)
+        self.jobs = jobs
+        self.srcsets = {}
+        self.stats = {'probed': 0, 'encoded': 0, 'cached': 0}
+
+    def _load_state(self):
+        try:
+            with open(os.path.join(self.cache_dir, STATE_FILE), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def run(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        previous = self._load_state()
+        state = {}
+        to_probe = []
+        for name in self.index.files:
+            st = os.stat(os.path.join(self.index.directory, name))
+            entry = previous.get(name)
+            if entry and entry['bytes'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+                state[name] = entry
+            else:
+                to_probe.append((name, st))
+
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            paths = [os.path.join(self.index.directory, name) for name, _st in to_probe]
+            for (name, st), probe in zip(to_probe, pool.map(probe_image, paths, chunksize=8)):
+                state[name] = {'bytes': st.st_size, 'mtime_ns': st.st_mtime_ns,
+                               'sha256': probe['sha256'], 'width': probe['width']}
+            self.stats['probed'] = len(to_probe)
+
+            tasks = []
+            for name in self.index.files:
+                entry = state[name]
+                key_dir = os.path.join(self.cache_dir, entry['sha256'][:16])
+                widths = target_widths(entry['width'])
+                missing = any(not os.path.exists(os.path.join(key_dir, variant_name(w, fmt)))
+                              for fmt in self.formats for w in widths)
+                if missing:
+                    tasks.append((os.path.join(self.index.directory, name), key_dir, widths, self.formats))
+                else:
+                    self.stats['cached'] += 1
+                self.srcsets[name] = {
+                    fmt: ', '.join(f'{URL_PREFIX}/{entry["sha256"][:16]}/{variant_name(w, fmt)} {w}w' for w in widths)
+                    for fmt in self.formats if widths
+                }
+            self.stats['encoded'] = sum(pool.map(build_variants, tasks))
+
+        metrics.count('cache.derivatives.hit', self.stats['cached'])
+        metrics.count('cache.derivatives.miss', len(tasks))
+        metrics.count('derivatives.probed', self.stats['probed'])
+        metrics.count('derivatives.encoded', self.stats['encoded'])
+
+        write_chunks_if_changed(os.path.join(self.cache_dir, STATE_FILE),
+                                [json.dumps(state, ensure_ascii=False, sort_keys=True, separators=(',', ':'))])
+        return self
+
+    def srcset_for(self, p):
+        """Carte format -> srcset de l'image du produit, ou None si elle est introuvable."""
+        name, _match = self.index.lookup(f"{p['name']} {p['brand']}")
+        return self.srcsets.get(name) or None
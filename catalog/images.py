@@ -0,0 +1,192 @@
+"""Vérification des images produits et manifeste de public/image-products.
+
+Le répertoire est parcouru une seule fois pour construire un index en mémoire ;
+chaque produit y est ensuite résolu par le nom attendu par le site, puis sans
+accents, puis par similarité, une seule fois par nom quelle que soit l'étape
+qui le demande. Le hachage et la lecture des dimensions se font dans un pool de
+processus.
+"""
+import difflib
+import hashlib
+import json
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+from .instrumentation import metrics
+from .text import image_slug, product_image_name
+
+DEFAULT_IMAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  'public', 'image-products')
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.avif')
+FUZZY_CUTOFF = 0.85
+MAX_FUZZY_CANDIDATES = 200
+IMAGE_URL_PREFIX = '/image-products/'
+
+# Marqueurs JPEG « start of frame » qui portent les dimensions
+_JPEG_SOF = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def image_size(data):
+    """Dimensions (largeur, hauteur) d'une image JPEG, PNG ou WebP, ou (None, None)."""
+    if data[:8] == b'\x89PNG\r\n\x1a\n' and len(data) >= 24:
+        return struct.unpack('>II', data[16:24])
+    if data[:2] == b'\xff\xd8':
+        pos = 2
+        while pos + 9 < len(data):
+            if data[pos] != 0xFF:
+                pos += 1
+                continue
+            marker = data[pos + 1]
+            if marker == 0xFF:
+                pos += 1
+                continue
+            if marker in _JPEG_SOF:
+                height, width = struct.unpack('>HH', data[pos + 5:pos + 9])
+                return width, height
+            if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+                pos += 2
+                continue
+            pos += 2 + struct.unpack('>H', data[pos + 2:pos + 4])[0]
+        return None, None
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP' and len(data) >= 30:
+        chunk = data[12:16]
+        if chunk == b'VP8 ':
+            width, height = struct.unpack('<HH', data[26:30])
+            return width & 0x3FFF, height & 0x3FFF
+        if chunk == b'VP8L':
+            bits = int.from_bytes(data[21:25], 'little')
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b'VP8X':
+            return int.from_bytes(data[24:27], 'little') + 1, int.from_bytes(data[27:30], 'little') + 1
+    return None, None
+
+
+def probe_image(path):
+    """Taille, dimensions et empreinte SHA-256 d'un fichier (exécuté dans un processus du pool)."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    width, height = image_size(data)
+    return {'bytes': len(data), 'width': width, 'height': height, 'sha256': hashlib.sha256(data).hexdigest()}
+
+
+class ImageIndex:
+    """Index en mémoire des fichiers image d'un répertoire."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.files = sorted(
+            entry.name for entry in os.scandir(directory)
+            if entry.is_file() and os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS
+        )
+        self.by_stem = {}
+        self.by_slug = {}
+        self._slugs_by_token = {}
+        self._file_set = set(self.files)
+        self._lookups = {}
+        for name in self.files:
+            stem = os.path.splitext(name)[0]
+            self.by_stem.setdefault(stem, name)
+            slug = image_slug(stem)
+            if slug not in self.by_slug:
+                for token in slug.split('_'):
+                    if len(token) >= 3:
+                        self._slugs_by_token.setdefault(token, set()).add(slug)
+            self.by_slug.setdefault(slug, []).append(name)
+
+    def resolve(self, slug):
+        """Fichier correspondant au slug et type de correspondance ('exact', 'folded', 'fuzzy'), ou (None, None)."""
+        if slug in self.by_stem:
+            return self.by_stem[slug], 'exact'
+        if slug in self.by_slug:
+            return self.by_slug[slug][0], 'folded'
+        # Seuls les slugs partageant les mots les plus rares du slug sont comparés, dans la
+        # limite de MAX_FUZZY_CANDIDATES : les mots fréquents (marques) renverraient tout le répertoire.
+        postings = sorted((self._slugs_by_token[token] for token in set(slug.split('_'))
+                           if token in self._slugs_by_token), key=len)
+        candidates = set()
+        for slugs in postings:
+            if len(candidates) + len(slugs) > MAX_FUZZY_CANDIDATES:
+                break
+            candidates |= slugs
+        match = difflib.get_close_matches(slug, sorted(candidates), n=1, cutoff=FUZZY_CUTOFF)
+        if match:
+            return self.by_slug[match[0]][0], 'fuzzy'
+        return None, None
+
+    def lookup(self, text):
+        """Fichier de l'image d'un produit (« nom marque ») et type de correspondance, mémoïsé.
+
+        Le nom calculé par le site (lib/utils.ts) est pris tel quel s'il existe, sinon le slug est résolu.
+        Les compteurs images.* sont incrémentés une fois par texte distinct, à la première résolution.
+        """
+        found = self._lookups.get(text)
+        if found is None:
+            expected = product_image_name(text)
+            found = (expected, 'exact') if expected in self._file_set else self.resolve(image_slug(text))
+            self._lookups[text] = found
+            metrics.count('cache.image-lookup.miss')
+            if found[0] is None:
+                metrics.count('images.missing')
+            else:
+                metrics.count('images.resolved')
+                metrics.count(f'images.match.{found[1]}')
+        else:
+            metrics.count('cache.image-lookup.hit')
+        return found
+
+
+def image_file(text, index=None):
+    """Fichier image d'un produit : celui résolu dans index, sinon le nom que calculerait le site."""
+    name = index.lookup(text)[0] if index is not None else None
+    return name or product_image_name(text)
+
+
+def image_path(text, index=None):
+    return IMAGE_URL_PREFIX + image_file(text, index)
+
+
+class ImageResolver:
+    """Étape du pipeline : résout l'image de chaque produit et produit le manifeste JSON."""
+
+    def __init__(self, directory=DEFAULT_IMAGES_DIR, jobs=None, index=None):
+        self.index = index if index is not None else ImageIndex(directory)
+        self.jobs = jobs
+        self.products = {}
+        self.missing = []
+
+    def add(self, product_id, cat_slug, p, is_best):
+        text = f"{p['name']} {p['brand']}"
+        name, match = self.index.lookup(text)
+        if name is None:
+            self.missing.append({'id': str(product_id), 'name': p['name'], 'brand': p['brand'],
+                                 'expected': product_image_name(text)})
+        else:
+            self.products[str(product_id)] = {'image': name, 'match': match}
+
+    def probe_all(self):
+        paths = [os.path.join(self.index.directory, name) for name in self.index.files]
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            probes = pool.map(probe_image, paths, chunksize=max(1, len(paths) // 64))
+            return dict(zip(self.index.files, probes))
+
+    def report(self):
+        probes = self.probe_all()
+        by_hash = {}
+        for name, probe in probes.items():
+            by_hash.setdefault(probe['sha256'], []).append(name)
+        used = {entry['image'] for entry in self.products.values()}
+        return {
+            'images': [{'path': IMAGE_URL_PREFIX + name, **probe} for name, probe in probes.items()],
+            'products': self.products,
+            'missing': self.missing,
+            'duplicates': {
+                'sameName': sorted(names for names in self.index.by_slug.values() if len(names) > 1),
+                'sameContent': sorted(names for names in by_hash.values() if len(names) > 1),
+            },
+            'unused': [name for name in self.index.files if name not in used],
+        }
+
+    def iter_json_chunks(self):
+        yield json.dumps(self.report(), ensure_ascii=False, indent=2)
+        yield '\n'
@@ -0,0 +1,120 @@
+"""Régénération incrémentale guidée par un manifeste d'empreintes.
+
+Le manifeste conserve, pour chaque morceau du fichier généré (en-tête, section
+de catégorie, produit), l'empreinte de sa source ainsi que sa position dans la
+sortie précédente. Les morceaux dont la source n'a pas changé sont recopiés tels
+quels au lieu d'être rendus à nouveau, et le fichier n'est pas réécrit du tout
+si son contenu final est identique.
+"""
+import hashlib
+import json
+import os
+
+from .instrumentation import metrics
+from .output import KeepExisting, open_output
+
+MANIFEST_VERSION = 1
+
+
+def content_digest(*values):
+    """Empreinte stable d'un ensemble de valeurs sérialisables en JSON."""
+    payload = json.dumps(values, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def file_digest(path):
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def code_digest(*paths):
+    """Empreinte du code qui rend la sortie : une modification de l'un de ces fichiers invalide le manifeste."""
+    return content_digest(*(file_digest(path) for path in paths))
+
+
+def default_manifest_path(output_path):
+    directory, name = os.path.split(output_path)
+    return os.path.join(directory, f'.{name}.manifest.json')
+
+
+def load_manifest(manifest_path, output_path, generator):
+    """Charge le manifeste précédent, ou None s'il ne correspond plus à la sortie sur disque."""
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != MANIFEST_VERSION or manifest.get('generator') != generator:
+        return None
+    try:
+        if file_digest(output_path) != manifest.get('output'):
+            return None
+    except OSError:
+        return None
+    return manifest
+
+
+def write_incremental(parts, output_path, manifest_path, generator):
+    """Écrit les morceaux `(clé, section, empreinte, rendu)` en réutilisant ceux qui n'ont pas changé.
+
+    Renvoie un dict de statistiques : morceaux rendus, réutilisés, sections modifiées
+    et si le fichier a effectivement été réécrit.
+    """
+    previous = load_manifest(manifest_path, output_path, generator)
+    previous_parts = {key: (digest, offset, length) for key, digest, offset, length in previous['parts']} if previous else {}
+    previous_sections = previous['sections'] if previous else {}
+
+    stats = {'rendered': 0, 'reused': 0, 'changed_sections': [], 'written': True}
+    entries = []
+    section_hashers = {}
+    hasher = hashlib.sha256()
+    offset = 0
+
+    old = open(output_path, 'rb') if previous else None
+    try:
+        with open_output(output_path, binary=True) as out:
+            for key, section, digest, render in parts:
+                cached = previous_parts.get(key)
+                if cached is not None and cached[0] == digest:
+                    old.seek(cached[1])
+                    data = old.read(cached[2])
+                    stats['reused'] += 1
+                else:
+                    data = render().encode('utf-8')
+                    stats['rendered'] += 1
+                out.write(data)
+                hasher.update(data)
+                entries.append([key, digest, offset, len(data)])
+                offset += len(data)
+                if section is not None:
+                    if section not in section_hashers:
+                        section_hashers[section] = hashlib.blake2b(digest_size=16)
+                    section_hashers[section].update(digest.encode('ascii'))
+
+            output = hasher.hexdigest()
+            if previous and previous['output'] == output:
+                stats['written'] = False
+                raise KeepExisting
+    finally:
+        if old is not None:
+            old.close()
+
+    metrics.count('cache.incremental.hit', stats['reused'])
+    metrics.count('cache.incremental.miss', stats['rendered'])
+    sections = {name: h.hexdigest() for name, h in section_hashers.items()}
+    stats['changed_sections'] = [name for name, digest in sections.items() if previous_sections.get(name) != digest]
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'generator': generator,
+        'output': output,
+        'sections': sections,
+        'parts': entries,
+    }
+    if manifest != previous:
+        with open_output(manifest_path) as f:
+            json.dump(manifest, f, ensure_ascii=False, separators=(',', ':'))
+    return stats
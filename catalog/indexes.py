@@ -0,0 +1,44 @@
+"""Index de recherche précalculés pendant le parcours du catalogue.
+
+Les index sont alimentés produit par produit pendant l'émission et ne
+contiennent que des identifiants : leur taille reste proportionnelle au
+nombre de produits, sans garder les fiches en mémoire.
+"""
+import json
+
+
+class ProductIndexBuilder:
+    """Accumule id → position, catégorie/marque/sous-catégorie → ids et la liste des best-sellers."""
+
+    def __init__(self):
+        self.by_id = {}
+        self.by_category = {}
+        self.by_brand = {}
+        self.by_sub_category = {}
+        self.best_sellers = []
+
+    def add(self, product_id, cat_slug, p, is_best):
+        product_id = str(product_id)
+        self.by_id[product_id] = len(self.by_id)
+        self.by_category.setdefault(cat_slug, []).append(product_id)
+        self.by_brand.setdefault(p['brand'], []).append(product_id)
+        if p.get('sub'):
+            self.by_sub_category.setdefault(p['sub'], []).append(product_id)
+        if is_best:
+            self.best_sellers.append(product_id)
+
+    def as_dict(self):
+        """Forme sérialisée, identique à l'interface ProductIndexes de types/index.ts."""
+        return {
+            'byId': self.by_id,
+            'byCategory': self.by_category,
+            'byBrand': self.by_brand,
+            'bySubCategory': self.by_sub_category,
+            'bestSellers': self.best_sellers,
+        }
+
+    def render_ts(self):
+        """Déclaration TypeScript `productIndexes`, une clé d'index par ligne."""
+        lines = [f'  {key}: {json.dumps(value, ensure_ascii=False, separators=(",", ":"))},'
+                 for key, value in self.as_dict().items()]
+        return 'export const productIndexes: ProductIndexes = {\n' + '\n'.join(lines) + '\n};\n'
@@ -0,0 +1,140 @@
+"""Chronomètres et compteurs nommés du pipeline, et mode profilage.
+
+Les étapes incrémentent le registre partagé `metrics` ; generate_products.py
+l'affiche (--stats) ou l'écrit en JSON avec le profil (--profile) à la fin de
+la génération. Les noms sont hiérarchiques : `products.<catégorie>`, `images.missing`,
+`cache.derivatives.hit`…
+"""
+import cProfile
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+REPORT_VERSION = 1
+TOP_ENTRIES = 50
+
+
+class Metrics:
+    """Temps cumulés (secondes) et compteurs entiers, indexés par nom."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.timers = {}
+        self.counters = {}
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_time(self, name, seconds):
+        self.timers[name] = self.timers.get(name, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def timed_iter(self, name, iterable):
+        """Relaie `iterable` en imputant à `name` le seul temps passé à produire chaque élément.
+
+        Utile pour une source paresseuse (lecture du catalogue) consommée au fil de l'émission.
+        """
+        it = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(it)
+            except StopIteration:
+                self.add_time(name, time.perf_counter() - start)
+                return
+            self.add_time(name, time.perf_counter() - start)
+            yield item
+
+    def merge(self, data, prefix=''):
+        """Ajoute les métriques `as_dict()` d'un autre registre (processus du pool), noms préfixés."""
+        for name, seconds in data['timers'].items():
+            self.add_time(prefix + name, seconds)
+        for name, value in data['counters'].items():
+            self.count(prefix + name, value)
+
+    def as_dict(self):
+        return {
+            'timers': {name: round(seconds, 6) for name, seconds in sorted(self.timers.items())},
+            'counters': dict(sorted(self.counters.items())),
+        }
+
+    def summary(self):
+        """Lignes lisibles : étapes par durée décroissante, puis compteurs."""
+        lines = [f'{name:<32} {seconds * 1000:10.1f} ms'
+                 for name, seconds in sorted(self.timers.items(), key=lambda item: -item[1])]
+        lines += [f'{name:<32} {value:>10}' for name, value in sorted(self.counters.items())]
+        return lines
+
+
+metrics = Metrics()
+
+
+def _display_path(filename):
+    return os.path.relpath(filename) if os.path.isabs(filename) else filename
+
+
+def _cpu_report(profiler, top):
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, function), (_cc, calls, tottime, cumtime, _callers) in stats.stats.items():
+        rows.append({
+            'function': function,
+            'file': _display_path(filename),
+            'line': line,
+            'calls': calls,
+            'tottime': round(tottime, 6),
+            'cumtime': round(cumtime, 6),
+        })
+    rows.sort(key=lambda row: -row['cumtime'])
+    return {'totalTime': round(stats.total_tt, 6), 'functions': rows[:top]}
+
+
+def _memory_report(snapshot, peak, top):
+    stats = snapshot.statistics('lineno')
+    return {
+        'peakBytes': peak,
+        'allocations': [{
+            'file': _display_path(stat.traceback[0].filename),
+            'line': stat.traceback[0].lineno,
+            'bytes': stat.size,
+            'blocks': stat.count,
+        } for stat in stats[:top]],
+    }
+
+
+def profile_call(fn, mode='cpu', top=TOP_ENTRIES):
+    """Exécute fn() sous cProfile ('cpu') ou tracemalloc ('memory').
+
+    Renvoie (résultat, rapport) ; le rapport ne couvre que le processus courant,
+    pas les pools de processus lancés par les étapes d'images.
+    """
+    if mode == 'cpu':
+        profiler = cProfile.Profile()
+        result = profiler.runcall(fn)
+        return result, _cpu_report(profiler, top)
+    if mode == 'memory':
+        tracemalloc.start()
+        try:
+            result = fn()
+            _current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        return result, _memory_report(snapshot, peak, top)
+    raise ValueError(f'mode de profilage inconnu : {mode}')
+
+
+def build_report(mode, profile):
+    """Rapport JSON : métriques du registre partagé et profil du mode choisi."""
+    return {'version': REPORT_VERSION, 'mode': mode, **metrics.as_dict(), 'profile': profile}
@@ -0,0 +1,91 @@
+"""Chargeurs du catalogue produits.
+
+Chaque chargeur lit une source ligne par ligne et produit des dictionnaires
+normalisés (category, name, brand, price, desc, sub) sans jamais charger
+tout le catalogue en mémoire.
+"""
+import csv
+import itertools
+import json
+import os
+import sqlite3
+
+REQUIRED_FIELDS = ('category', 'name', 'brand', 'price', 'desc')
+
+# Noms de colonnes acceptés dans les exports fournisseurs (style snake_case de lib/database)
+FIELD_ALIASES = {
+    'category_slug': 'category',
+    'description': 'desc',
+    'sub_category': 'sub',
+    'subCategory': 'sub',
+}
+
+
+def normalize_row(raw, where):
+    """Ramène une ligne brute au format attendu par l'émetteur."""
+    row = {}
+    for key, value in raw.items():
+        field = FIELD_ALIASES.get(key, key)
+        if field in row:
+            raise ValueError(f'{where}: champ {field} présent sous plusieurs noms')
+        row[field] = value
+    missing = [field for field in REQUIRED_FIELDS if row.get(field) in (None, '')]
+    if missing:
+        raise ValueError(f'{where}: champ(s) manquant(s) {", ".join(missing)}')
+    return {
+        'category': row['category'],
+        'name': row['name'],
+        'brand': row['brand'],
+        'price': float(row['price']),
+        'desc': row['desc'],
+        'sub': row.get('sub') or '',
+    }
+
+
+def iter_jsonl(path):
+    with open(path, encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            if line.strip():
+                yield normalize_row(json.loads(line), f'{path}:{line_no}')
+
+
+def iter_csv(path):
+    with open(path, encoding='utf-8', newline='') as f:
+        for line_no, raw in enumerate(csv.DictReader(f), 2):
+            yield normalize_row(raw, f'{path}:{line_no}')
+
+
+def iter_sqlite(path, table='products'):
+    """Lit la table `products` (colonnes category, name, brand, price, description, sub_category)."""
+    conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        cursor = conn.execute(f'SELECT * FROM "{table}" ORDER BY rowid')
+        for row_no, raw in enumerate(cursor, 1):
+            yield normalize_row(dict(raw), f'{path}:{table}#{row_no}')
+    finally:
+        conn.close()
+
+
+LOADERS = {
+    '.jsonl': iter_jsonl,
+    '.csv': iter_csv,
+    '.db': iter_sqlite,
+    '.sqlite': iter_sqlite,
+    '.sqlite3': iter_sqlite,
+}
+
+
+def iter_rows(path):
+    """Choisit le chargeur d'après l'extension du fichier."""
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        loader = LOADERS[ext]
+    except KeyError:
+        raise ValueError(f'{path}: format non supporté (attendu : {", ".join(sorted(LOADERS))})') from None
+    return loader(path)
+
+
+def iter_categories(rows):
+    """Regroupe les lignes consécutives par catégorie : (slug, itérateur de produits)."""
+    return itertools.groupby(rows, key=lambda row: row['category'])
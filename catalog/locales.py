@@ -0,0 +1,170 @@
+"""Catalogues localisés et cache de traductions.
+
+Les textes traduisibles des produits (description, sous-catégorie) et les
+sous-catégories du bloc des catégories sont identifiés par l'empreinte de leur
+texte source. Les traductions sont gardées dans une base SQLite locale, clé
+(langue, empreinte) : seuls les textes nouveaux ou modifiés sont à traduire
+d'une génération à l'autre.
+
+Un traducteur externe peut être branché (`--translator CMD`) : la commande
+reçoit sur stdin une ligne JSON par texte manquant
+(`{"key", "locale", "sourceLocale", "source"}`) et doit répondre sur stdout une
+ligne `{"key", "text"}` par traduction. Sans traducteur, les textes manquants
+gardent leur version source et peuvent être exportés pour être complétés puis
+réimportés (`--import-translations`, lignes `{"locale", "source", "text"}`).
+"""
+import hashlib
+import json
+import os
+import shlex
+import sqlite3
+import subprocess
+
+from .instrumentation import metrics
+
+SOURCE_LOCALE = 'fr'
+LOCALES = ('fr', 'nl', 'en', 'de')
+LONG_DESCRIPTION_SUFFIXES = {
+    'fr': '. Produit de qualité professionnelle disponible aux Pays-Bas.',
+    'nl': '. Product van professionele kwaliteit, verkrijgbaar in Nederland.',
+    'en': '. Professional-quality product available in the Netherlands.',
+    'de': '. Produkt in professioneller Qualität, erhältlich in den Niederlanden.',
+}
+TRANSLATED_FIELDS = ('desc', 'sub')
+DEFAULT_TRANSLATIONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'translations.sqlite')
+
+
+def text_key(text):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def locale_path(path, locale):
+    """Chemin de sortie d'une langue : lib/data.ts -> lib/data.nl.ts."""
+    root, ext = os.path.splitext(path)
+    return f'{root}.{locale}{ext}'
+
+
+class TranslationCache:
+    """Table clé-valeur (langue, empreinte du texte source) -> traduction."""
+
+    def __init__(self, path=DEFAULT_TRANSLATIONS_PATH):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('CREATE TABLE IF NOT EXISTS translations ('
+                          'locale TEXT NOT NULL, key TEXT NOT NULL, source TEXT NOT NULL, text TEXT NOT NULL, '
+                          'PRIMARY KEY (locale, key))')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.conn.close()
+
+    def get_many(self, locale, keys):
+        found = {}
+        keys = list(keys)
+        # Par lots : SQLite limite le nombre de paramètres d'une requête
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            cursor = self.conn.execute(
+                f'SELECT key, text FROM translations WHERE locale = ? AND key IN ({",".join("?" * len(batch))})',
+                [locale, *batch])
+            found.update(cursor.fetchall())
+        return found
+
+    def put_many(self, locale, entries):
+        """Enregistre `entries`, des couples (texte source, traduction)."""
+        with self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)',
+                                  [(locale, text_key(source), source, text) for source, text in entries])
+
+    def import_jsonl(self, path):
+        """Importe des lignes `{"locale", "source", "text"}` et renvoie le nombre de traductions retenues."""
+        by_locale = {}
+        with open(path, encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry.get('text'):
+                    if entry.get('locale') not in LOCALES:
+                        raise ValueError(f"{path}:{line_no}: langue inconnue {entry.get('locale')!r}")
+                    by_locale.setdefault(entry['locale'], []).append((entry['source'], entry['text']))
+        for locale, entries in by_locale.items():
+            self.put_many(locale, entries)
+        return sum(len(entries) for entries in by_locale.values())
+
+
+def translate(table, text):
+    """Traduction de `text` dans la table d'une langue, ou le texte source à défaut."""
+    return table.get(text_key(text), text)
+
+
+def translatable_texts(rows, extra_texts=()):
+    """Textes source distincts à traduire, par empreinte."""
+    texts = {text_key(text): text for text in extra_texts if text}
+    for p in rows:
+        for field in TRANSLATED_FIELDS:
+            text = p.get(field)
+            if text:
+                texts.setdefault(text_key(text), text)
+    return texts
+
+
+def run_translator(command, locale, sources):
+    """Traduit `sources` (empreinte -> texte) avec la commande externe ; renvoie empreinte -> traduction."""
+    payload = ''.join(json.dumps({'key': key, 'locale': locale, 'sourceLocale': SOURCE_LOCALE, 'source': text},
+                                 ensure_ascii=False) + '\n' for key, text in sources.items())
+    result = subprocess.run(shlex.split(command), input=payload, capture_output=True, text=True, encoding='utf-8',
+                            check=True)
+    translated = {}
+    for line in result.stdout.splitlines():
+        if line.strip():
+            entry = json.loads(line)
+            if entry.get('key') in sources and entry.get('text'):
+                translated[entry['key']] = entry['text']
+    return translated
+
+
+def resolve_translations(rows, locales, cache, translator=None, extra_texts=()):
+    """Tables empreinte -> traduction pour chaque langue, et textes restés sans traduction.
+
+    `extra_texts` ajoute des textes hors produits (sous-catégories du bloc des
+    catégories). Seules les empreintes absentes du cache sont confiées au
+    traducteur ; ses réponses y sont enregistrées.
+    """
+    texts = translatable_texts(rows, extra_texts)
+    tables, missing = {}, {}
+    for locale in locales:
+        if locale == SOURCE_LOCALE:
+            tables[locale] = {}
+            continue
+        table = cache.get_many(locale, texts)
+        todo = {key: text for key, text in texts.items() if key not in table}
+        metrics.count('cache.translations.hit', len(table))
+        metrics.count('cache.translations.miss', len(todo))
+        if todo and translator:
+            translated = run_translator(translator, locale, todo)
+            metrics.count('translations.translated', len(translated))
+            cache.put_many(locale, [(todo[key], text) for key, text in translated.items()])
+            table.update(translated)
+            todo = {key: text for key, text in todo.items() if key not in translated}
+        tables[locale] = table
+        if todo:
+            missing[locale] = todo
+    return tables, missing
+
+
+def localize_rows(rows, locale, table):
+    """Copie des lignes avec textes traduits (source à défaut) et longue description de la langue."""
+    if locale == SOURCE_LOCALE:
+        return rows
+    suffix = LONG_DESCRIPTION_SUFFIXES[locale]
+    localized = []
+    for p in rows:
+        p = dict(p)
+        for field in TRANSLATED_FIELDS:
+            if p.get(field):
+                p[field] = translate(table, p[field])
+        p['long_desc'] = p['desc'] + suffix
+        localized.append(p)
+    return localized
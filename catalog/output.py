@@ -0,0 +1,91 @@
+"""Écriture des fichiers générés : sortie bufferisée et remplacement atomique."""
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+from .instrumentation import metrics
+
+BUFFER_SIZE = 1 << 16
+
+
+def _target_mode(path):
+    """Mode du fichier existant, ou 0o666 filtré par l'umask comme pour un open() classique."""
+    try:
+        return os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+class KeepExisting(Exception):
+    """Levée dans un bloc open_output pour abandonner l'écriture et laisser le fichier intact."""
+
+
+@contextmanager
+def open_output(path, binary=False):
+    """Ouvre la sortie : stdout si path est vide, sinon un fichier temporaire renommé atomiquement."""
+    if not path:
+        out = sys.stdout.buffer if binary else sys.stdout
+        yield out
+        out.flush()
+        return
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', dir=directory)
+    try:
+        os.chmod(tmp_path, _target_mode(path))
+        if binary:
+            out = os.fdopen(fd, 'wb', buffering=BUFFER_SIZE)
+        else:
+            out = os.fdopen(fd, 'w', encoding='utf-8', newline='\n', buffering=BUFFER_SIZE)
+        with out:
+            yield out
+    except KeepExisting:
+        os.unlink(tmp_path)
+        metrics.count('output.unchanged')
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    else:
+        os.replace(tmp_path, path)
+        metrics.count('output.files')
+        metrics.count('output.bytes', os.path.getsize(path))
+
+
+def write_chunks(chunks, out):
+    """Écrit chaque morceau dès qu'il est produit et renvoie le nombre de caractères écrits."""
+    written = 0
+    for chunk in chunks:
+        out.write(chunk)
+        written += len(chunk)
+    metrics.count('output.chars', written)
+    return written
+
+
+def write_chunks_if_changed(path, chunks):
+    """Écrit les morceaux dans path sauf si le contenu obtenu est identique à l'existant.
+
+    La comparaison se fait au fil de l'écriture, sans charger l'ancien fichier.
+    Renvoie True si le fichier a été (ré)écrit.
+    """
+    try:
+        old = open(path, 'rb')
+    except FileNotFoundError:
+        old = None
+    same = old is not None
+    try:
+        with open_output(path, binary=True) as out:
+            for chunk in chunks:
+                data = chunk.encode('utf-8')
+                out.write(data)
+                if same:
+                    same = old.read(len(data)) == data
+            if same and not old.read(1):
+                raise KeepExisting
+            same = False
+    finally:
+        if old is not None:
+            old.close()
+    return not same
@@ -0,0 +1,330 @@
+"""Tables de recommandations précalculées (produits similaires et complémentaires).
+
+Chaque produit est réduit à quelques caractéristiques compactes pendant
+l'émission (catégorie, sous-catégorie, marque, tranche de prix, jetons de la
+description) ; les top-K sont ensuite calculés par blocs de candidats, sans
+comparer toutes les paires du catalogue. NumPy est utilisé s'il est installé,
+sinon un calcul en Python pur donne exactement le même résultat. NumPy n'est importé qu'au calcul des tables, pas à l'import du
+module : les générations sans --recommendations ne paient pas son chargement.
+"""
+import heapq
+import importlib.util
+import itertools
+import json
+import math
+
+from .text import tokenize
+
+# Doit rester aligné avec complementaryCategories dans lib/recommendations.ts
+COMPLEMENTARY_CATEGORIES = {
+    'soins-visage': ['maquillage', 'soins-corps'],
+    'maquillage': ['soins-visage', 'cheveux'],
+    'soins-corps': ['soins-visage', 'parfums'],
+    'cheveux': ['soins-corps', 'accessoires'],
+    'parfums': ['maquillage', 'accessoires'],
+}
+
+PRICE_BAND_WIDTH = 10.0
+
+# Poids entiers : les scores restent exacts et identiques entre NumPy et Python
+SIMILAR_WEIGHTS = {'category': 3000, 'sub': 2000, 'brand': 2000, 'band': 1000, 'tokens': 2000}
+COMPLEMENTARY_WEIGHTS = {'category': 3000, 'best': 1500, 'brand': 1000, 'band': 1000, 'tokens': 1000}
+
+STOP_WORDS = frozenset({
+    'les', 'des', 'pour', 'avec', 'aux', 'une', 'sur', 'dans', 'par', 'and', 'the', 'for', 'with',
+})
+
+
+def description_tokens(*texts):
+    """Jetons sans accents d'au moins trois caractères, hors mots vides."""
+    return frozenset(t for t in tokenize(' '.join(texts)) if len(t) >= 3 and t not in STOP_WORDS)
+
+
+class _Interner:
+    def __init__(self):
+        self.ids = {}
+
+    def __call__(self, value):
+        return self.ids.setdefault(value, len(self.ids))
+
+
+class RecommendationBuilder:
+    """Collecte les caractéristiques des produits puis calcule les top-K par produit."""
+
+    def __init__(self, similar_k=4, complementary_k=3, batch_cells=1 << 22, use_numpy=None):
+        self.similar_k = similar_k
+        self.complementary_k = complementary_k
+        self.batch_cells = batch_cells
+        self.use_numpy = importlib.util.find_spec('numpy') is not None if use_numpy is None else use_numpy
+        self._values = _Interner()
+        self._tokens = _Interner()
+        self.ids = []
+        self.categories = []
+        self.subs = []
+        self.brands = []
+        self.bands = []
+        self.best = []
+        self.token_sets = []
+
+    def add(self, product_id, cat_slug, p, is_best):
+        self.ids.append(str(product_id))
+        self.categories.append(self._values(('category', cat_slug)))
+        self.subs.append(self._values(('sub', p['sub'])) if p.get('sub') else -1)
+        self.brands.append(self._values(('brand', p['brand'])))
+        self.bands.append(int(p['price'] // PRICE_BAND_WIDTH))
+        self.best.append(bool(is_best))
+        self.token_sets.append(frozenset(self._tokens(t) for t in description_tokens(p['name'], p['desc'])))
+
+    def _complementary_matrix(self):
+        """Pour chaque catégorie interne, l'ensemble des catégories internes complémentaires."""
+        slugs = {key[1]: value for key, value in self._values.ids.items() if key[0] == 'category'}
+        return {
+            cat_id: {slugs[c] for c in COMPLEMENTARY_CATEGORIES.get(slug, []) if c in slugs}
+            for slug, cat_id in slugs.items()
+        }
+
+    def compute(self):
+        """Renvoie (similaires, complémentaires) : une liste d'ids par produit, dans l'ordre d'ajout."""
+        if not self.ids:
+            return [], []
+        compute = self._top_numpy if self.use_numpy else self._top_python
+        return compute(False, self.similar_k), compute(True, self.complementary_k)
+
+    # -- Blocs de candidats -------------------------------------------------
+    #
+    # Hors jetons, le score d'une paire ne dépend que des profils des deux
+    # produits : (catégorie, sous-catégorie, marque, tranche) pour les similaires,
+    # (catégorie, marque, tranche, meilleure vente) pour les complémentaires. Les
+    # produits sont regroupés par profil et, pour un profil donné, les profils
+    # candidats sont parcourus par score de base décroissant. Un profil dont la
+    # base plus le poids maximal des jetons reste sous le k-ième meilleur score
+    # déjà trouvé est écarté, ainsi que tous les suivants ; dans un profil
+    # retenu, seuls les produits partageant des jetons et les k premiers
+    # produits peuvent entrer dans le top-K. Le résultat est exactement celui
+    # d'une comparaison de toutes les paires.
+
+    def _profile(self, i, complementary):
+        if complementary:
+            return self.categories[i], self.brands[i], self.bands[i], self.best[i]
+        return self.categories[i], self.subs[i], self.brands[i], self.bands[i]
+
+    def _profiles(self, complementary):
+        """Profil -> positions croissantes des produits qui le partagent."""
+        groups = {}
+        for i in range(len(self.ids)):
+            groups.setdefault(self._profile(i, complementary), []).append(i)
+        return groups
+
+    def _plans(self, profiles, complementary):
+        """Pour chaque profil, les (score de base, profil candidat) par base décroissante.
+
+        Pour les complémentaires, les profils ni complémentaires ni meilleures ventes sont exclus.
+        """
+        compl_of = self._complementary_matrix()
+        plans = {}
+        for own in profiles:
+            plan = []
+            for other in profiles:
+                if complementary:
+                    w = COMPLEMENTARY_WEIGHTS
+                    in_compl = other[0] in compl_of[own[0]]
+                    if not (in_compl or other[3]):
+                        continue
+                    base = (w['category'] * in_compl + w['best'] * other[3]
+                            + w['brand'] * (other[1] == own[1]) + w['band'] * (other[2] == own[2]))
+                else:
+                    w = SIMILAR_WEIGHTS
+                    base = (w['category'] * (other[0] == own[0]) + w['sub'] * (own[1] >= 0 and other[1] == own[1])
+                            + w['brand'] * (other[2] == own[2]) + w['band'] * (other[3] == own[3]))
+                plan.append((base, other))
+            plan.sort(key=lambda entry: -entry[0])
+            plans[own] = plan
+        return plans
+
+    # -- Python pur ---------------------------------------------------------
+
+    def _top_python(self, complementary, k):
+        if k <= 0:
+            return [[] for _ in self.ids]
+        w_tokens = (COMPLEMENTARY_WEIGHTS if complementary else SIMILAR_WEIGHTS)['tokens']
+        profiles = self._profiles(complementary)
+        plans = self._plans(profiles, complementary)
+        postings = {}
+        doc_freq = {}
+        for profile, members in profiles.items():
+            by_token = postings[profile] = {}
+            for j in members:
+                for t in self.token_sets[j]:
+                    by_token.setdefault(t, []).append(j)
+                    doc_freq[t] = doc_freq.get(t, 0) + 1
+
+        result = []
+        for i in range(len(self.ids)):
+            tokens_i = self.token_sets[i]
+            # Jetons les plus rares d'abord : le filtre par préfixe n'interroge que le début de la liste
+            rare_first = sorted(tokens_i, key=doc_freq.__getitem__)
+            seen = set()
+            top = []  # tas des k meilleurs (score, -position)
+
+            def offer(j, base):
+                seen.add(j)
+                inter = len(tokens_i & self.token_sets[j])
+                union = len(tokens_i) + len(self.token_sets[j]) - inter
+                entry = (base + (round(w_tokens * (inter / union)) if union else 0), -j)
+                if len(top) < k:
+                    heapq.heappush(top, entry)
+                elif entry > top[0]:
+                    heapq.heapreplace(top, entry)
+
+            for base, profile in plans[self._profile(i, complementary)]:
+                bound = top[0][0] if len(top) == k else None
+                if bound is not None and base + w_tokens < bound:
+                    break
+                if bound is None or base >= bound:
+                    # Sans jeton commun, un produit vaut `base` : seuls les k premiers du profil comptent
+                    for j in itertools.islice((j for j in profiles[profile] if j != i), k):
+                        offer(j, base)
+                    probe = rare_first
+                else:
+                    # round(w * J) >= bound - base exige J >= tau, donc au moins tau·|A| jetons communs :
+                    # un produit retenu contient l'un des |A| - ceil(tau·|A|) + 1 premiers jetons
+                    tau = (bound - base - 0.5) / w_tokens
+                    probe = rare_first[:len(rare_first) - math.ceil(tau * len(rare_first) - 1e-9) + 1]
+                by_token = postings[profile]
+                for t in probe:
+                    for j in by_token.get(t, ()):
+                        if j != i and j not in seen:
+                            offer(j, base)
+            result.append([self.ids[-neg_j] for _score, neg_j in sorted(top, reverse=True)])
+        return result
+
+    # -- NumPy --------------------------------------------------------------
+
+    def _top_numpy(self, complementary, k):
+        """Même parcours que _top_python, vectorisé sur un lot de produits d'un même profil.
+
+        Pour chaque profil candidat, les paires partageant des jetons sont obtenues
+        par jointure des listes (jeton, produit) triées, sans matrice dense ; le
+        lot est borné à `batch_cells` cellules lot × profil candidat.
+        """
+        import numpy as np
+
+        n = len(self.ids)
+        k = min(k, n - 1)
+        if k <= 0:
+            return [[] for _ in range(n)]
+        w_tokens = (COMPLEMENTARY_WEIGHTS if complementary else SIMILAR_WEIGHTS)['tokens']
+        profiles = {profile: np.asarray(members, dtype=np.int64)
+                    for profile, members in self._profiles(complementary).items()}
+        plans = self._plans(profiles, complementary)
+        lengths = np.asarray([len(tokens) for tokens in self.token_sets], dtype=np.int64)
+        starts = np.cumsum(lengths) - lengths
+        flat_tokens = np.fromiter((t for tokens in self.token_sets for t in tokens), dtype=np.int64,
+                                  count=int(lengths.sum()))
+
+        def ranges(lo, counts):
+            """Concaténation des intervalles [lo, lo + count) : indices de CSR sans boucle Python."""
+            return np.repeat(lo - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+        def token_pairs(members):
+            """(jeton, indice local du produit) des produits `members`, triés par jeton."""
+            counts = lengths[members]
+            tokens = flat_tokens[ranges(starts[members], counts)]
+            local = np.repeat(np.arange(len(members)), counts)
+            order = np.argsort(tokens, kind='stable')
+            return tokens[order], local[order]
+
+        def shared_tokens(rows, cols):
+            """Paires (ligne, colonne) locales, une occurrence par jeton commun."""
+            row_tokens, row_local = rows
+            col_tokens, col_local = cols
+            lo = np.searchsorted(col_tokens, row_tokens, 'left')
+            counts = np.searchsorted(col_tokens, row_tokens, 'right') - lo
+            return np.repeat(row_local, counts), col_local[ranges(lo, counts)]
+
+        def merge_top(top_s, top_p, rows, scores, positions):
+            """Fusionne des candidats (ligne, score, position) dans les top-K par ligne.
+
+            Départage par position croissante, comme le tri Python ; les cases vides valent -1.
+            """
+            # Un candidat sous le k-ième score de sa ligne ne peut pas entrer
+            keep = scores >= top_s[rows, -1]
+            rows, scores, positions = rows[keep], scores[keep], positions[keep]
+            m = len(top_s)
+            all_rows = np.concatenate([np.repeat(np.arange(m), k), rows])
+            all_s = np.concatenate([top_s.ravel(), scores])
+            all_p = np.concatenate([top_p.ravel(), positions])
+            # Clé unique : ligne croissante, puis score décroissant, puis position croissante
+            rank_key = (all_s + 1) * (n + 1) + (n - all_p)
+            order = np.argsort(all_rows * (rank_key.max() + 1) - rank_key, kind='stable')
+            all_rows, all_s, all_p = all_rows[order], all_s[order], all_p[order]
+            rank = np.arange(len(all_rows)) - np.searchsorted(all_rows, all_rows)
+            keep = rank < k
+            top_s, top_p = np.empty_like(top_s), np.empty_like(top_p)
+            top_s[all_rows[keep], rank[keep]] = all_s[keep]
+            top_p[all_rows[keep], rank[keep]] = all_p[keep]
+            return top_s, top_p
+
+        def tier_columns(tier):
+            """Produits des profils d'un même score de base, leurs paires (jeton, colonne) et leurs têtes."""
+            cols = np.concatenate([profiles[profile] for profile in tier])
+            head = np.zeros(len(cols), dtype=bool)
+            offset = 0
+            for profile in tier:
+                head[offset:offset + k + 1] = True
+                offset += len(profiles[profile])
+            return cols, token_pairs(cols), head
+
+        result = [None] * n
+        for own, members in profiles.items():
+            # Les profils de même base sont traités en un seul bloc
+            tiers = [(base, [profile for _base, profile in group])
+                     for base, group in itertools.groupby(plans[own], key=lambda entry: entry[0])]
+            columns = {}
+            widest = max((sum(len(profiles[profile]) for profile in tier) for _base, tier in tiers), default=1)
+            batch_size = max(1, self.batch_cells // widest)
+            for start in range(0, len(members), batch_size):
+                rows = members[start:start + batch_size]
+                m = len(rows)
+                row_pairs = token_pairs(rows)
+                top_s = np.full((m, k), -1, dtype=np.int64)
+                top_p = np.full((m, k), n, dtype=np.int64)
+                for tier_index, (base, tier) in enumerate(tiers):
+                    if base + w_tokens < top_s[:, -1].min():
+                        break
+                    if tier_index not in columns:
+                        columns[tier_index] = tier_columns(tier)
+                    cols, col_pairs, head = columns[tier_index]
+                    width = len(cols)
+                    # Têtes de profil pour chaque ligne, puis une occurrence par jeton commun
+                    head_cols = np.flatnonzero(head)
+                    r, c = shared_tokens(row_pairs, col_pairs)
+                    codes = np.concatenate([np.repeat(np.arange(m), len(head_cols)) * width + np.tile(head_cols, m),
+                                            r * width + c])
+                    codes, inter = np.unique(codes, return_counts=True)
+                    pr, pc = np.divmod(codes, width)
+                    inter -= head[pc]
+                    pos = cols[pc]
+                    keep = pos != rows[pr]
+                    pr, pos, inter = pr[keep], pos[keep], inter[keep]
+                    union = lengths[rows[pr]] + lengths[pos] - inter
+                    jaccard = np.divide(inter, union, out=np.zeros(len(inter)), where=union > 0)
+                    score = base + np.rint(w_tokens * jaccard).astype(np.int64)
+                    top_s, top_p = merge_top(top_s, top_p, pr, score, pos)
+                for i, scores, positions in zip(rows.tolist(), top_s.tolist(), top_p.tolist()):
+                    result[i] = [self.ids[j] for score, j in zip(scores, positions) if score >= 0]
+        return result
+
+    # -- Émission -----------------------------------------------------------
+
+    def iter_ts_chunks(self):
+        """Module TypeScript `productRecommendations`, une ligne par produit."""
+        similar, complementary = self.compute()
+        yield "import { RecommendationTable } from '@/types';\n\n"
+        yield 'export const productRecommendations: RecommendationTable = {\n'
+        for name, table in (('similar', similar), ('complementary', complementary)):
+            yield f'  {name}: {{\n'
+            for product_id, ids in zip(self.ids, table):
+                yield f'    "{product_id}": {json.dumps(ids, separators=(",", ":"))},\n'
+            yield '  },\n'
+        yield '};\n'
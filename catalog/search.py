@@ -0,0 +1,74 @@
+"""Index inversé de recherche construit pendant la génération.
+
+Format sérialisé (interface SearchIndex de types/index.ts) :
+- `ids` : identifiants des produits, dans l'ordre du catalogue ;
+- `terms` : termes triés (jetons complets et leurs préfixes) ;
+- `postings` : pour chaque terme, la liste croissante `position << 6 | champs`,
+  où `champs` est un masque des champs contenant le terme. FIELD_NAME_WORD
+  distingue un mot entier du nom d'un simple début de mot.
+"""
+import json
+
+from .text import strip_joiners, tokenize
+
+FIELD_NAME = 1
+FIELD_BRAND = 2
+FIELD_DESC = 4
+FIELD_SUB = 8
+FIELD_CATEGORY = 16
+FIELD_NAME_WORD = 32
+FIELD_BITS = 6
+
+MIN_PREFIX_LENGTH = 2
+
+
+class SearchIndexBuilder:
+    """Accumule les listes de postings de chaque terme, produit par produit."""
+
+    def __init__(self, category_names=None, min_prefix_length=MIN_PREFIX_LENGTH):
+        """`category_names` (slug -> nom) ajoute le nom de la catégorie à son slug dans le champ catégorie."""
+        self.category_names = category_names or {}
+        self.min_prefix_length = min_prefix_length
+        self.ids = []
+        self._postings = {}
+
+    def _terms(self, text):
+        """Jetons du texte, avec et sans apostrophes/tirets, et leurs préfixes : terme -> mot entier ?"""
+        tokens = dict.fromkeys(tokenize(text))
+        tokens.update(dict.fromkeys(tokenize(strip_joiners(text))))
+        terms = {}
+        for token in tokens:
+            terms[token] = True
+            for end in range(self.min_prefix_length, len(token)):
+                terms.setdefault(token[:end], False)
+        return terms
+
+    def add(self, product_id, cat_slug, p, is_best):
+        position = len(self.ids)
+        self.ids.append(str(product_id))
+        fields = {}
+        category = f"{cat_slug} {self.category_names.get(cat_slug, '')}"
+        for field, text in ((FIELD_NAME, p['name']), (FIELD_BRAND, p['brand']), (FIELD_DESC, p['desc']),
+                            (FIELD_SUB, p.get('sub', '')), (FIELD_CATEGORY, category)):
+            word_bonus = FIELD_NAME_WORD if field == FIELD_NAME else 0
+            for term, whole in self._terms(text).items():
+                fields[term] = fields.get(term, 0) | field | (word_bonus if whole else 0)
+        for term, mask in fields.items():
+            self._postings.setdefault(term, []).append(position << FIELD_BITS | mask)
+
+    def compute(self):
+        """Index au format SearchIndex : ids, termes triés et postings de chaque terme."""
+        terms = sorted(self._postings)
+        return {'ids': self.ids, 'terms': terms, 'postings': [self._postings[term] for term in terms]}
+
+    def iter_ts_chunks(self):
+        """Module TypeScript `searchIndex` : table des termes triée puis une liste de postings par ligne."""
+        index = self.compute()
+        yield "import { SearchIndex } from '@/types';\n\n"
+        yield 'export const searchIndex: SearchIndex = {\n'
+        yield f'  ids: {json.dumps(index["ids"], separators=(",", ":"))},\n'
+        yield f'  terms: {json.dumps(index["terms"], separators=(",", ":"))},\n'
+        yield '  postings: [\n'
+        for postings in index['postings']:
+            yield f'    {json.dumps(postings, separators=(",", ":"))},\n'
+        yield '  ],\n};\n'
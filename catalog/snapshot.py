@@ -0,0 +1,80 @@
+"""Instantané colonnaire du catalogue, alternative aux littéraux TypeScript.
+
+Chaque champ est stocké une seule fois sous forme de colonne. Les chaînes
+répétitives (catégorie, sous-catégorie, marque) sont dédoublonnées dans une
+table de chaînes et remplacées par leur indice ; les nombres forment des
+tableaux homogènes. Le fichier image de chaque produit est résolu à la
+génération. lib/catalogSnapshot.ts reconstruit les objets Product.
+"""
+import json
+from array import array
+
+from .images import image_file
+
+SNAPSHOT_VERSION = 2
+
+
+class SnapshotBuilder:
+    """Accumule les colonnes produit par produit ; `metrics(product_id)` donne (note, nombre d'avis).
+
+    `image_index` (ImageIndex) sert à résoudre les fichiers images ; sans lui, le nom calculé par le site est repris.
+    """
+
+    def __init__(self, metrics, long_description_suffix, image_index=None):
+        self.metrics = metrics
+        self.long_description_suffix = long_description_suffix
+        self.image_index = image_index
+        self.strings = {}
+        self.ids = array('L')
+        self.names = []
+        self.descriptions = []
+        self.prices = array('d')
+        self.images = []
+        self.categories = array('L')
+        self.sub_categories = array('L')
+        self.brands = array('L')
+        self.ratings = array('d')
+        self.reviews_counts = array('L')
+        self.best_sellers = array('B')
+
+    def _string(self, value):
+        return self.strings.setdefault(value, len(self.strings))
+
+    def add(self, product_id, cat_slug, p, is_best):
+        rating, reviews_count = self.metrics(product_id)
+        self.ids.append(product_id)
+        self.names.append(p['name'])
+        self.descriptions.append(p['desc'])
+        self.prices.append(p['price'])
+        self.images.append(image_file(f"{p['name']} {p['brand']}", self.image_index))
+        self.categories.append(self._string(cat_slug))
+        self.sub_categories.append(self._string(p.get('sub', '')))
+        self.brands.append(self._string(p['brand']))
+        self.ratings.append(rating)
+        self.reviews_counts.append(reviews_count)
+        self.best_sellers.append(1 if is_best else 0)
+
+    def iter_json_chunks(self):
+        """Document JSON compact (interface CatalogSnapshot de types/index.ts), une colonne par morceau."""
+        def dump(value):
+            return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+        columns = (
+            ('id', self.ids.tolist()),
+            ('name', self.names),
+            ('description', self.descriptions),
+            ('price', self.prices.tolist()),
+            ('image', self.images),
+            ('category', self.categories.tolist()),
+            ('subCategory', self.sub_categories.tolist()),
+            ('brand', self.brands.tolist()),
+            ('rating', self.ratings.tolist()),
+            ('reviewsCount', self.reviews_counts.tolist()),
+            ('isBestSeller', self.best_sellers.tolist()),
+        )
+        yield (f'{{"version":{SNAPSHOT_VERSION},"count":{len(self.ids)},'
+               f'"longDescriptionSuffix":{dump(self.long_description_suffix)},'
+               f'"strings":{dump(list(self.strings))},"columns":{{')
+        for i, (name, values) in enumerate(columns):
+            yield f'{"," if i else ""}\n"{name}":{dump(values)}'
+        yield '\n}}\n'
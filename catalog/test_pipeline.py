@@ -0,0 +1,340 @@
+"""Invariants du pipeline de génération : python -m pytest catalog"""
+import csv
+import io
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+
+import pytest
+
+from catalog import iter_rows
+from catalog.loaders import normalize_row
+from catalog.images import ImageIndex, image_size
+from catalog.incremental import default_manifest_path, write_incremental
+from catalog.instrumentation import metrics
+from catalog.locales import localize_rows, text_key
+from catalog.output import write_chunks_if_changed
+from catalog.benchmark import synthesize
+from catalog.recommendations import COMPLEMENTARY_WEIGHTS, SIMILAR_WEIGHTS, RecommendationBuilder
+from catalog.search import SearchIndexBuilder
+from catalog.text import image_slug, product_image_name
+from generate_products import (category_names, category_sub_categories, is_best_seller, iter_ts_chunks,
+                               iter_ts_parts, main, parse_args)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE = os.path.join(ROOT, 'catalog', 'products.jsonl')
+
+
+def write_catalog(path, rows):
+    with open(path, 'w', encoding='utf-8') as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+
+@pytest.fixture
+def rows():
+    return list(iter_rows(SOURCE))
+
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+# -- write_chunks_if_changed ------------------------------------------------
+
+def test_write_if_changed_creates_then_keeps(tmp_path):
+    path = str(tmp_path / 'out.txt')
+    assert write_chunks_if_changed(path, ['abc', 'déf'])
+    mtime = os.stat(path).st_mtime_ns
+    assert not write_chunks_if_changed(path, ['ab', 'cdéf'])
+    assert os.stat(path).st_mtime_ns == mtime
+    assert read(path) == 'abcdéf'
+
+
+@pytest.mark.parametrize('old', ['abcdéf + suite', 'abc', 'abcdéF', ''])
+def test_write_if_changed_rewrites_different_content(tmp_path, old):
+    path = str(tmp_path / 'out.txt')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(old)
+    assert write_chunks_if_changed(path, ['abc', 'déf'])
+    assert read(path) == 'abcdéf'
+
+
+# -- chargeurs -----------------------------------------------------------------
+
+def test_loaders_give_identical_output(tmp_path, rows):
+    fields = ('category', 'name', 'brand', 'price', 'desc', 'sub')
+    write_catalog(tmp_path / 'products.jsonl', rows)
+    with open(tmp_path / 'products.csv', 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        writer.writerows([row[field] for field in fields] for row in rows)
+    # Table au format de lib/database : colonnes renommées par FIELD_ALIASES
+    conn = sqlite3.connect(tmp_path / 'products.db')
+    conn.execute('CREATE TABLE products (category_slug TEXT, name TEXT, brand TEXT, price REAL, '
+                 'description TEXT, sub_category TEXT)')
+    conn.executemany('INSERT INTO products VALUES (?, ?, ?, ?, ?, ?)',
+                     ([row[field] for field in fields] for row in rows))
+    conn.commit()
+    conn.close()
+
+    outputs = []
+    for ext in ('jsonl', 'csv', 'db'):
+        out = tmp_path / f'data.{ext}.ts'
+        main(['-i', str(tmp_path / f'products.{ext}'), '-o', str(out), '--indexes'])
+        outputs.append(out.read_bytes())
+    assert outputs[0] == outputs[1] == outputs[2]
+
+
+def test_normalize_row_rejects_aliased_duplicates():
+    raw = {'category': 'cheveux', 'name': 'Shampooing', 'brand': 'Klorane', 'price': 9.9,
+           'desc': 'Doux', 'description': 'Très doux'}
+    with pytest.raises(ValueError, match='products.csv:7: champ desc'):
+        normalize_row(raw, 'products.csv:7')
+
+
+# -- arguments -----------------------------------------------------------------
+
+@pytest.mark.parametrize('argv', [
+    ['-o', 'absent/data.ts'],
+    ['-o', 'absent/data.ts', '--locales', 'en'],
+    ['--search-index', 'absent/search.json'],
+    ['-j', '0'],
+    ['-j', '-2'],
+])
+def test_parse_args_rejects_before_running(tmp_path, capsys, argv):
+    argv = [str(tmp_path / arg) if arg.startswith('absent/') else arg for arg in argv]
+    with pytest.raises(SystemExit) as exc:
+        parse_args(argv)
+    assert exc.value.code == 2
+    assert 'Traceback' not in capsys.readouterr().err
+
+
+# -- dimensions lues dans l'en-tête des images ---------------------------------
+
+def encode(size, format, mode='RGB', **options):
+    Image = pytest.importorskip('PIL.Image')
+    buffer = io.BytesIO()
+    # Fond transparent en RGBA : le WebP passe alors au format étendu (VP8X)
+    color = (255, 255, 255, 0) if mode == 'RGBA' else 'white'
+    Image.new(mode, size, color).save(buffer, format, **options)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize('format, mode, options', [
+    ('JPEG', 'RGB', {}),
+    ('JPEG', 'RGB', {'progressive': True}),
+    ('JPEG', 'L', {}),
+    ('PNG', 'RGB', {}),
+    ('PNG', 'RGBA', {}),
+    ('WEBP', 'RGB', {}),
+    ('WEBP', 'RGB', {'lossless': True}),
+    ('WEBP', 'RGBA', {}),
+])
+def test_image_size_reads_headers(format, mode, options):
+    assert image_size(encode((301, 157), format, mode, **options)) == (301, 157)
+
+
+def test_image_size_skips_jpeg_segments_before_frame():
+    data = encode((64, 48), 'JPEG')
+    # Segment APP1 et octets de bourrage 0xFF insérés avant l'en-tête de trame
+    data = data[:2] + b'\xff\xe1\x00\x08exif\x00\x00' + b'\xff' + data[2:]
+    assert image_size(data) == (64, 48)
+
+
+@pytest.mark.parametrize('data', [b'', b'GIF89a' + bytes(20), b'\x89PNG\r\n\x1a\n', b'\xff\xd8\xff\xe0\x00\x10',
+                                  b'RIFF\x00\x00\x00\x00WEBPVP8 '])
+def test_image_size_unknown_or_truncated(data):
+    assert image_size(data) == (None, None)
+
+
+def test_image_lookup_counts_each_name_once(tmp_path):
+    for name in ('sérum_éclat_lumière.jpg', 'Crème_de_Nuit_Marque.jpg'):
+        (tmp_path / name).write_bytes(b'')
+    index = ImageIndex(str(tmp_path))
+    metrics.reset()
+    for text in ('Sérum Éclat Lumière', 'Crème de nuit Marque', 'Introuvable', 'Sérum Éclat Lumière'):
+        index.lookup(text)
+    counters = metrics.as_dict()['counters']
+    assert counters['images.resolved'] == 2 and counters['images.missing'] == 1
+    assert counters['images.match.exact'] == 1 and counters['images.match.folded'] == 1
+    assert counters['cache.image-lookup.hit'] == 1
+
+
+# -- noms d'images --------------------------------------------------------------
+
+# (nom, productNameToImageName de lib/utils.ts, productNameToImageName de lib/data.ts avant le .jpg
+# et les corrections de fichiers), sorties relevées sous Node
+IMAGE_NAMES = [
+    ('Fluide Solaire Teinté SPF30', 'fluide_solaire_teinté_spf30.jpg', 'fluide_solaire_teinte_spf30'),
+    ('Sérum Anti-Âge', 'sérum_antiâge.jpg', 'serum_antiage'),
+    ("L'Oréal Paris", 'loréal_paris.jpg', 'loreal_paris'),
+    ('Revitalift L’Oréal Paris', 'revitalift_loréal_paris.jpg', 'revitalift_loreal_paris'),
+    ('Accessoires beauté', 'accessoires_beauté.jpg', 'accessoires_beaute'),
+    ('100% Plant-Derived', '100_plantderived.jpg', '100_plantderived'),
+    ('Gel + Crème', 'gel_crème.jpg', 'gel_creme'),
+    ('  Huile   sèche  corps ', 'huile_sèche_corps.jpg', 'huile_seche_corps'),
+    ('Eau de Toilette - 100 ml', 'eau_de_toilette_100_ml.jpg', 'eau_de_toilette_100_ml'),
+    ('Crème Mains & Ongles', 'crème_mains_ongles.jpg', 'creme_mains_ongles'),
+    ('Brume Cœur Ñandú', 'brume_cur_andú.jpg', 'brume_c_ur_nandu'),
+]
+
+
+@pytest.mark.parametrize('name, site_name, slug', IMAGE_NAMES)
+def test_image_names_match_typescript_rules(name, site_name, slug):
+    assert product_image_name(name) == site_name
+    assert image_slug(name) == slug
+
+
+# -- mode incrémental ---------------------------------------------------------
+
+def incremental(source, output):
+    parts = iter_ts_parts(iter_rows(source))
+    return write_incremental(parts, output, default_manifest_path(output), 'test')
+
+
+def full(source):
+    return ''.join(iter_ts_chunks(iter_rows(source)))
+
+
+def test_incremental_matches_full_rebuild_after_edits(tmp_path, rows):
+    source, output = str(tmp_path / 'products.jsonl'), str(tmp_path / 'data.ts')
+    write_catalog(source, rows)
+    assert incremental(source, output)['rendered'] > 0
+    assert read(output) == full(source)
+
+    stats = incremental(source, output)
+    assert (stats['rendered'], stats['written']) == (0, False)
+
+    rows[3]['price'] = 99.99
+    del rows[40]
+    rows[100]['desc'] = 'Nouvelle description'
+    write_catalog(source, rows)
+    stats = incremental(source, output)
+    assert stats['written']
+    assert read(output) == full(source)
+    # Les ids des produits suivant la ligne supprimée changent, ceux qui précèdent sont recopiés
+    assert stats['reused'] > 0
+
+
+def test_incremental_ignores_stale_manifest(tmp_path, rows):
+    source, output = str(tmp_path / 'products.jsonl'), str(tmp_path / 'data.ts')
+    write_catalog(source, rows[:20])
+    incremental(source, output)
+    # Sortie modifiée à la main : le manifeste ne correspond plus, tout est rendu à nouveau
+    with open(output, 'a', encoding='utf-8') as f:
+        f.write('// édition manuelle\n')
+    stats = incremental(source, output)
+    assert stats['reused'] == 0
+    assert read(output) == full(source)
+
+
+# -- catalogues localisés ----------------------------------------------------
+
+def test_localized_sub_categories_match_categories(rows):
+    texts = category_sub_categories() + [p['sub'] for p in rows if p.get('sub')]
+    table = {text_key(text): 'NL ' + text for text in texts}
+    localized = localize_rows(rows, 'nl', table)
+    output = ''.join(iter_ts_chunks(localized, translations=table))
+    # Les liens du menu (?subCategory=…) doivent retrouver les produits de la même langue
+    linked = {'NL ' + name for name in category_sub_categories()}
+    assert {p['sub'] for p in localized if p['sub']} <= linked
+    assert all(f"'{name}'" in output for name in linked)
+
+
+# -- index de recherche --------------------------------------------------------
+
+# Transpile lib/search.ts avec le compilateur TypeScript du projet (npm install)
+# puis construit l'index des produits reçus sur stdin
+BUILD_SEARCH_INDEX_JS = '''
+const fs = require('fs');
+const ts = require('typescript');
+const source = fs.readFileSync('lib/search.ts', 'utf8');
+const { outputText } = ts.transpileModule(source, {
+  compilerOptions: { module: ts.ModuleKind.CommonJS, target: ts.ScriptTarget.ES2020 },
+});
+const search = {};
+new Function('exports', 'require', outputText)(search, require);
+const { products, categories } = JSON.parse(fs.readFileSync(0, 'utf8'));
+process.stdout.write(JSON.stringify(search.buildSearchIndex(products, categories)));
+'''
+
+
+def test_search_index_matches_typescript_builder(rows):
+    if shutil.which('node') is None:
+        pytest.skip('node introuvable')
+    if subprocess.run(['node', '-e', "require.resolve('typescript')"], cwd=ROOT, capture_output=True).returncode:
+        pytest.skip('typescript non installé (npm install)')
+    names = category_names()
+    builder = SearchIndexBuilder(names)
+    products = []
+    for product_id, p in enumerate(rows, 1):
+        builder.add(product_id, p['category'], p, is_best_seller(product_id))
+        products.append({'id': str(product_id), 'name': p['name'], 'brand': p['brand'], 'description': p['desc'],
+                         'subCategory': p['sub'], 'category': p['category']})
+    payload = json.dumps({'products': products, 'categories': [{'slug': slug, 'name': name}
+                                                                for slug, name in names.items()]})
+    result = subprocess.run(['node', '-e', BUILD_SEARCH_INDEX_JS], cwd=ROOT, input=payload, capture_output=True,
+                            text=True, encoding='utf-8', check=True)
+    assert json.loads(result.stdout) == builder.compute()
+
+
+# -- recommandations ----------------------------------------------------------
+
+def recommendations(rows, **options):
+    builder = RecommendationBuilder(**options)
+    for product_id, p in enumerate(rows, 1):
+        builder.add(product_id, p['category'], p, is_best_seller(product_id))
+    return builder.compute()
+
+
+@pytest.mark.parametrize('batch_cells', [1, 181, 1000, 1 << 22])
+def test_numpy_matches_python(rows, batch_cells):
+    pytest.importorskip('numpy')
+    expected = recommendations(rows, use_numpy=False)
+    assert recommendations(rows, use_numpy=True, batch_cells=batch_cells) == expected
+    assert all(len(similar) == 4 for similar in expected[0])
+
+
+def all_pairs(b, complementary, k):
+    """Référence : score de toutes les paires, tri (score décroissant, position croissante)."""
+    w = COMPLEMENTARY_WEIGHTS if complementary else SIMILAR_WEIGHTS
+    compl_of = b._complementary_matrix()
+    table = []
+    for i in range(len(b.ids)):
+        ranked = []
+        for j in range(len(b.ids)):
+            if j == i:
+                continue
+            if complementary:
+                in_compl = b.categories[j] in compl_of[b.categories[i]]
+                if not (in_compl or b.best[j]):
+                    continue
+                score = w['category'] * in_compl + w['best'] * b.best[j]
+            else:
+                score = (w['category'] * (b.categories[j] == b.categories[i])
+                         + w['sub'] * (b.subs[i] >= 0 and b.subs[j] == b.subs[i]))
+            score += w['brand'] * (b.brands[j] == b.brands[i]) + w['band'] * (b.bands[j] == b.bands[i])
+            inter = len(b.token_sets[i] & b.token_sets[j])
+            union = len(b.token_sets[i]) + len(b.token_sets[j]) - inter
+            ranked.append((-(score + (round(w['tokens'] * inter / union) if union else 0)), j))
+        table.append([b.ids[j] for _score, j in sorted(ranked)[:k]])
+    return table
+
+
+@pytest.mark.parametrize('use_numpy', [False, True])
+@pytest.mark.parametrize('size', [3, 180, 500])
+def test_recommendations_match_all_pairs(tmp_path, rows, use_numpy, size):
+    if use_numpy:
+        pytest.importorskip('numpy')
+    if size > len(rows):
+        # Catalogue synthétique du banc d'essai : profils plus nombreux et plus remplis
+        synthesize(size, str(tmp_path / 'products.jsonl'))
+        rows = list(iter_rows(str(tmp_path / 'products.jsonl')))
+    builder = RecommendationBuilder(use_numpy=use_numpy, batch_cells=1000)
+    for product_id, p in enumerate(rows[:size], 1):
+        builder.add(product_id, p['category'], p, is_best_seller(product_id))
+    assert builder.compute() == (all_pairs(builder, False, 4), all_pairs(builder, True, 3))
@@ -0,0 +1,82 @@
+"""Normalisation de texte partagée par les étapes du pipeline.
+
+Seule implémentation côté génération des règles de nommage des images : les
+noms sont découpés en mots et chaque mot n'est normalisé qu'une fois grâce à
+un cache LRU, les caractères accentués courants passant par une table de
+traduction précalculée plutôt que par la décomposition Unicode.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+TOKEN_CACHE_SIZE = 1 << 16
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+_WORD_RE = re.compile(r'\S+')
+# Apostrophes et tirets, supprimés sans séparateur (l'oréal -> loreal, anti-âge -> antiage)
+_JOINERS_RE = re.compile(r"['’‘`ʼ-]")
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+# Caractères conservés par productNameToImageName (lib/utils.ts)
+_SITE_REJECTED_RE = re.compile('[^a-z0-9_àáâãäåèéêëìíîïòóôõöùúûüýÿç]')
+_UNDERSCORES_RE = re.compile('_{2,}')
+
+
+def _strip_marks(text):
+    return ''.join(c for c in unicodedata.normalize('NFD', text) if not '\u0300' <= c <= '\u036f')
+
+
+# Latin-1 et Latin étendu A/B : lettre accentuée -> lettre de base, calculé une fois
+_FOLD_TABLE = {code: _strip_marks(chr(code)) for code in range(0xC0, 0x250)
+               if _strip_marks(chr(code)) != chr(code)}
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _fold_word(word):
+    folded = word.lower().translate(_FOLD_TABLE)
+    return folded if folded.isascii() else _strip_marks(folded)
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _slug_word(word):
+    return _NON_ALNUM_RE.sub('_', _JOINERS_RE.sub('', _fold_word(word))).strip('_')
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _site_word(word):
+    return _SITE_REJECTED_RE.sub('', word.lower())
+
+
+def fold_accents(text):
+    """Minuscules sans diacritiques, comme `normalize('NFD').replace(/[\\u0300-\\u036f]/g, '')` côté TypeScript."""
+    return _WORD_RE.sub(lambda m: _fold_word(m.group()), text)
+
+
+def strip_joiners(text):
+    return _JOINERS_RE.sub('', text)
+
+
+def tokenize(text):
+    """Jetons alphanumériques du texte sans accents, dans l'ordre d'apparition."""
+    return _TOKEN_RE.findall(fold_accents(text))
+
+
+def image_slug(text):
+    """Clé de comparaison des noms d'images : sans accents, apostrophes ni tirets.
+
+    "L'Oréal Paris" -> "loreal_paris", "100% Plant-Derived" -> "100_plantderived".
+    """
+    return '_'.join(slug for slug in map(_slug_word, text.split()) if slug)
+
+
+def product_image_name(text):
+    """Nom de fichier image attendu par le site, comme productNameToImageName dans lib/utils.ts.
+
+    Les accents français sont conservés : "Sérum Anti-Âge" -> "sérum_antiâge.jpg".
+    """
+    return _UNDERSCORES_RE.sub('_', '_'.join(map(_site_word, text.split()))).strip('_') + '.jpg'
+
+
+def token_cache_info():
+    """Statistiques des caches par mot (succès, échecs), pour l'instrumentation."""
+    infos = [cache.cache_info() for cache in (_fold_word, _slug_word, _site_word)]
+    return sum(info.hits for info in infos), sum(info.misses for info in infos)
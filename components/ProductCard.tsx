@@ -1,7 +1,7 @@
 'use client';
 
 import Link from 'next/link';
-import Image from 'next/image';
+import ProductImage from '@/components/ProductImage';
 import { FiStar, FiShoppingCart } from 'react-icons/fi';
 import { Product } from '@/types';
 import { useCartStore } from '@/lib/store';
@@ -26,10 +26,8 @@ export default function ProductCard({ product }: ProductCardProps) {
       <div className="card-product group h-full flex flex-col">
         {/* Image */}
         <div className="relative overflow-hidden bg-white aspect-square">
-          <Image
-            src={product.image}
-            alt={product.name}
-            fill
+          <ProductImage
+            product={product}
             className="object-cover group-hover:scale-110 transition-transform duration-500"
             sizes="(max-width: 640px) 100vw, (max-width: 1024px) 50vw, 25vw"
           />
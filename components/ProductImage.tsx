@@ -0,0 +1,45 @@
+import Image from 'next/image';
+import { Product } from '@/types';
+
+interface ProductImageProps {
+  product: Product;
+  src?: string;
+  alt?: string;
+  sizes: string;
+  className?: string;
+  priority?: boolean;
+}
+
+// Ordre des <source> : le navigateur retient le premier format qu'il sait décoder
+const SOURCE_TYPES: [string, string][] = [
+  ['avif', 'image/avif'],
+  ['webp', 'image/webp'],
+];
+
+/**
+ * Image produit en mode `fill`. Quand le générateur a produit des déclinaisons
+ * (imageSrcSet), le navigateur choisit format et largeur selon `sizes` au lieu
+ * de télécharger le JPEG d'origine.
+ */
+export default function ProductImage({
+  product,
+  src = product.image,
+  alt = product.name,
+  sizes,
+  className,
+  priority,
+}: ProductImageProps) {
+  const image = <Image src={src} alt={alt} fill className={className} sizes={sizes} priority={priority} />;
+  // Les déclinaisons ne concernent que l'image principale du produit
+  const srcSet = src === product.image ? product.imageSrcSet : undefined;
+  if (!srcSet) return image;
+
+  return (
+    <picture>
+      {SOURCE_TYPES.filter(([format]) => srcSet[format]).map(([format, type]) => (
+        <source key={format} type={type} srcSet={srcSet[format]} sizes={sizes} />
+      ))}
+      {image}
+    </picture>
+  );
+}
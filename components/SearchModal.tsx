@@ -3,10 +3,27 @@
 import { useState, useEffect, useRef } from 'react';
 import { useRouter } from 'next/navigation';
 import { FiSearch, FiX } from 'react-icons/fi';
-import { products } from '@/lib/data';
-import Image from 'next/image';
+import { categories, products } from '@/lib/data';
+import { buildSearchIndex, searchProductIds } from '@/lib/search';
+import { Product, SearchIndex } from '@/types';
+import ProductImage from '@/components/ProductImage';
 import Link from 'next/link';
 
+// Index construit une seule fois, à la première recherche
+let searchIndex: SearchIndex | null = null;
+let productsById: Map<string, Product> | null = null;
+
+function searchProducts(query: string): Product[] {
+  if (!searchIndex || !productsById) {
+    searchIndex = buildSearchIndex(products, categories);
+    productsById = new Map(products.map(product => [product.id, product]));
+  }
+  const byId = productsById;
+  return searchProductIds(searchIndex, query, 12)
+    .map(id => byId.get(id))
+    .filter((product): product is Product => product !== undefined);
+}
+
 interface SearchModalProps {
   isOpen: boolean;
   onClose: () => void;
@@ -14,7 +31,7 @@ interface SearchModalProps {
 
 export default function SearchModal({ isOpen, onClose }: SearchModalProps) {
   const [searchQuery, setSearchQuery] = useState('');
-  const [results, setResults] = useState<any[]>([]);
+  const [results, setResults] = useState<Product[]>([]);
   const inputRef = useRef<HTMLInputElement>(null);
   const router = useRouter();
 
@@ -26,40 +43,7 @@ export default function SearchModal({ isOpen, onClose }: SearchModalProps) {
 
   useEffect(() => {
     if (searchQuery.trim().length > 0) {
-      const query = searchQuery.toLowerCase().trim();
-      const queryWords = query.split(/\s+/);
-      
-      // Recherche avancée avec scoring
-      const scored = products.map(product => {
-        let score = 0;
-        const nameLower = product.name.toLowerCase();
-        const descLower = product.description.toLowerCase();
-        const brandLower = product.brand?.toLowerCase() || '';
-        const categoryLower = product.category.toLowerCase();
-        
-        queryWords.forEach(word => {
-          // Nom exact : score élevé
-          if (nameLower === word) score += 100;
-          // Nom commence par : score moyen-élevé
-          else if (nameLower.startsWith(word)) score += 50;
-          // Nom contient : score moyen
-          else if (nameLower.includes(word)) score += 30;
-          // Description contient : score faible
-          if (descLower.includes(word)) score += 10;
-          // Marque correspond : score moyen
-          if (brandLower.includes(word)) score += 20;
-          // Catégorie correspond : score faible
-          if (categoryLower.includes(word)) score += 5;
-        });
-        
-        return { product, score };
-      })
-      .filter(item => item.score > 0)
-      .sort((a, b) => b.score - a.score)
-      .slice(0, 12)
-      .map(item => item.product);
-      
-      setResults(scored);
+      setResults(searchProducts(searchQuery));
     } else {
       setResults([]);
     }
@@ -116,12 +100,7 @@ export default function SearchModal({ isOpen, onClose }: SearchModalProps) {
                   className="w-full flex items-center gap-4 p-3 hover:bg-beige rounded-lg transition text-left"
                 >
                   <div className="relative w-16 h-16 rounded-lg overflow-hidden bg-white-cream flex-shrink-0">
-                    <Image
-                      src={product.image}
-                      alt={product.name}
-                      fill
-                      className="object-cover"
-                    />
+                    <ProductImage product={product} className="object-cover" sizes="64px" />
                   </div>
                   <div className="flex-1 min-w-0">
                     <p className="font-medium text-brown-dark truncate">{product.name}</p>
@@ -1,224 +1,30 @@
+import argparse
+import itertools
 import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 
-products_data = {
-    'soins-visage': [
-        {'name': 'Buffet', 'brand': 'The Ordinary', 'price': 24.90, 'desc': 'Sérum multi-peptides pour réduire les signes de l\'âge', 'sub': 'Sérums'},
-        {'name': 'Niacinamide 10% + Zinc 1%', 'brand': 'The Ordinary', 'price': 25.90, 'desc': 'Sérum niacinamide pour minimiser les pores', 'sub': 'Sérums'},
-        {'name': 'Hyaluronic Acid 2% + B5', 'brand': 'The Ordinary', 'price': 22.90, 'desc': 'Sérum acide hyaluronique hydratant', 'sub': 'Sérums'},
-        {'name': 'Retinol 1% in Squalane', 'brand': 'The Ordinary', 'price': 28.90, 'desc': 'Sérum rétinol anti-âge', 'sub': 'Sérums'},
-        {'name': 'Vitamin C Suspension 23% + HA Spheres 2%', 'brand': 'The Ordinary', 'price': 26.90, 'desc': 'Sérum vitamine C éclat', 'sub': 'Sérums'},
-        {'name': 'AHA 30% + BHA 2% Peeling Solution', 'brand': 'The Ordinary', 'price': 29.90, 'desc': 'Masque peeling exfoliant', 'sub': 'Masques'},
-        {'name': 'Revitalift Filler', 'brand': 'L\'Oréal Paris', 'price': 34.99, 'desc': 'Crème anti-âge repulpante', 'sub': 'Crèmes hydratantes'},
-        {'name': 'Revitalift Laser X3', 'brand': 'L\'Oréal Paris', 'price': 39.99, 'desc': 'Crème anti-rides intensive', 'sub': 'Crèmes hydratantes'},
-        {'name': 'Age Perfect Cell Renewal', 'brand': 'L\'Oréal Paris', 'price': 44.99, 'desc': 'Crème régénérante mature', 'sub': 'Crèmes hydratantes'},
-        {'name': 'Hydra Genius', 'brand': 'L\'Oréal Paris', 'price': 32.99, 'desc': 'Crème hydratante légère', 'sub': 'Crèmes hydratantes'},
-        {'name': 'Pure Hyaluronic Acid Serum', 'brand': 'The Inkey List', 'price': 23.90, 'desc': 'Sérum acide hyaluronique pur', 'sub': 'Sérums'},
-        {'name': 'Retinol Serum', 'brand': 'The Inkey List', 'price': 24.90, 'desc': 'Sérum rétinol concentré', 'sub': 'Sérums'},
-        {'name': 'Q10 Anti-Wrinkle Day Cream', 'brand': 'Nivea', 'price': 28.99, 'desc': 'Crème anti-rides jour', 'sub': 'Crèmes hydratantes'},
-        {'name': 'Q10 Plus Anti-Age Night Cream', 'brand': 'Nivea', 'price': 29.99, 'desc': 'Crème anti-âge nuit', 'sub': 'Crèmes hydratantes'},
-        {'name': 'Soft Moisturising Cream', 'brand': 'Nivea', 'price': 22.99, 'desc': 'Crème hydratante douce', 'sub': 'Crèmes hydratantes'},
-        {'name': 'The Ritual of Namaste', 'brand': 'Rituals', 'price': 34.95, 'desc': 'Crème visage ayurvédique', 'sub': 'Crèmes hydratantes'},
-        {'name': 'The Ritual of Sakura', 'brand': 'Rituals', 'price': 32.95, 'desc': 'Crème hydratante cerisier', 'sub': 'Crèmes hydratantes'},
-        {'name': 'The Ritual of Karma', 'brand': 'Rituals', 'price': 36.95, 'desc': 'Crème anti-âge karma', 'sub': 'Crèmes hydratantes'},
-        {'name': 'Micellar Cleansing Water', 'brand': 'Garnier', 'price': 21.99, 'desc': 'Eau micellaire nettoyante', 'sub': 'Nettoyants'},
-        {'name': 'Micellar Cleansing Gel', 'brand': 'Garnier', 'price': 22.99, 'desc': 'Gel nettoyant micellaire', 'sub': 'Nettoyants'},
-        {'name': 'Vitamin C Brightening Serum', 'brand': 'Garnier', 'price': 24.99, 'desc': 'Sérum vitamine C éclat', 'sub': 'Sérums'},
-        {'name': 'Organic Argan Oil', 'brand': 'The Ordinary', 'price': 23.90, 'desc': 'Huile argan organique', 'sub': 'Sérums'},
-        {'name': '100% Plant-Derived Squalane', 'brand': 'The Ordinary', 'price': 22.90, 'desc': 'Huile squalane végétale', 'sub': 'Sérums'},
-        {'name': 'Natural Moisturizing Factors + HA', 'brand': 'The Ordinary', 'price': 21.90, 'desc': 'Crème hydratante naturelle', 'sub': 'Crèmes hydratantes'},
-        {'name': 'Matrixyl 10% + HA', 'brand': 'The Ordinary', 'price': 27.90, 'desc': 'Sérum peptides anti-âge', 'sub': 'Sérums'},
-        {'name': 'Argireline Solution 10%', 'brand': 'The Ordinary', 'price': 26.90, 'desc': 'Sérum anti-rides argireline', 'sub': 'Sérums'},
-        {'name': 'Caffeine Solution 5% + EGCG', 'brand': 'The Ordinary', 'price': 25.90, 'desc': 'Sérum contour des yeux', 'sub': 'Sérums'},
-        {'name': 'Lactic Acid 10% + HA', 'brand': 'The Ordinary', 'price': 24.90, 'desc': 'Sérum acide lactique', 'sub': 'Sérums'},
-        {'name': 'Glycolic Acid 7% Toning Solution', 'brand': 'The Ordinary', 'price': 23.90, 'desc': 'Tonique acide glycolique', 'sub': 'Nettoyants'},
-        {'name': 'Salicylic Acid 2% Solution', 'brand': 'The Ordinary', 'price': 22.90, 'desc': 'Sérum acide salicylique', 'sub': 'Sérums'},
-    ],
-    'maquillage': [
-        {'name': 'True Match Foundation', 'brand': 'L\'Oréal Paris', 'price': 24.99, 'desc': 'Fond de teint correspondance parfaite', 'sub': 'Fond de teint'},
-        {'name': 'Infallible 24H Fresh Wear', 'brand': 'L\'Oréal Paris', 'price': 29.99, 'desc': 'Fond de teint longue tenue 24h', 'sub': 'Fond de teint'},
-        {'name': 'Age Perfect Foundation', 'brand': 'L\'Oréal Paris', 'price': 34.99, 'desc': 'Fond de teint mature', 'sub': 'Fond de teint'},
-        {'name': 'Superstay Matte Ink', 'brand': 'Maybelline', 'price': 25.99, 'desc': 'Rouge à lèvres liquide mat', 'sub': 'Rouge à lèvres'},
-        {'name': 'Color Sensational', 'brand': 'Maybelline', 'price': 22.99, 'desc': 'Rouge à lèvres sensation couleur', 'sub': 'Rouge à lèvres'},
-        {'name': 'Lash Sensational Mascara', 'brand': 'Maybelline', 'price': 23.99, 'desc': 'Mascara cils sensationnels', 'sub': 'Mascara'},
-        {'name': 'The Falsies Mascara', 'brand': 'Maybelline', 'price': 24.99, 'desc': 'Mascara volume faux cils', 'sub': 'Mascara'},
-        {'name': 'Great Lash Mascara', 'brand': 'Maybelline', 'price': 21.99, 'desc': 'Mascara grand cils', 'sub': 'Mascara'},
-        {'name': 'Fit Me! Foundation', 'brand': 'Maybelline', 'price': 22.99, 'desc': 'Fond de teint ajusté', 'sub': 'Fond de teint'},
-        {'name': 'Master Precise Liquid Eyeliner', 'brand': 'Maybelline', 'price': 23.99, 'desc': 'Eyeliner liquide précis', 'sub': 'Fond de teint'},
-        {'name': 'Colorama Nail Polish', 'brand': 'Maybelline', 'price': 21.99, 'desc': 'Vernis à ongles colorama', 'sub': 'Fond de teint'},
-        {'name': 'Dream Satin Liquid Foundation', 'brand': 'Maybelline', 'price': 24.99, 'desc': 'Fond de teint liquide satin', 'sub': 'Fond de teint'},
-        {'name': 'Instant Age Rewind Concealer', 'brand': 'Maybelline', 'price': 22.99, 'desc': 'Correcteur anti-âge', 'sub': 'Fond de teint'},
-        {'name': 'Master Chrome Highlighter', 'brand': 'Maybelline', 'price': 25.99, 'desc': 'Highlighter chrome', 'sub': 'Highlighter'},
-        {'name': 'The Blushed Nudes Palette', 'brand': 'Maybelline', 'price': 28.99, 'desc': 'Palette fards nude', 'sub': 'Palettes'},
-        {'name': 'The Nudes Palette', 'brand': 'Maybelline', 'price': 27.99, 'desc': 'Palette nude', 'sub': 'Palettes'},
-        {'name': 'Color Riche Lipstick', 'brand': 'L\'Oréal Paris', 'price': 23.99, 'desc': 'Rouge à lèvres riche couleur', 'sub': 'Rouge à lèvres'},
-        {'name': 'Volume Million Lashes', 'brand': 'L\'Oréal Paris', 'price': 26.99, 'desc': 'Mascara million cils', 'sub': 'Mascara'},
-        {'name': 'Telescopic Mascara', 'brand': 'L\'Oréal Paris', 'price': 27.99, 'desc': 'Mascara télescopique', 'sub': 'Mascara'},
-        {'name': 'Liner Signature', 'brand': 'L\'Oréal Paris', 'price': 25.99, 'desc': 'Eyeliner signature', 'sub': 'Fond de teint'},
-        {'name': 'Blush Subtil', 'brand': 'L\'Oréal Paris', 'price': 24.99, 'desc': 'Blush subtil', 'sub': 'Fond de teint'},
-        {'name': 'Glow Paradise', 'brand': 'L\'Oréal Paris', 'price': 28.99, 'desc': 'Baume à lèvres teinté', 'sub': 'Rouge à lèvres'},
-        {'name': 'Age Perfect Radiant Serum Foundation', 'brand': 'L\'Oréal Paris', 'price': 32.99, 'desc': 'Fond de teint sérum', 'sub': 'Fond de teint'},
-        {'name': 'Infallible Pro-Matte Foundation', 'brand': 'L\'Oréal Paris', 'price': 29.99, 'desc': 'Fond de teint mat', 'sub': 'Fond de teint'},
-        {'name': 'True Match Lumi Foundation', 'brand': 'L\'Oréal Paris', 'price': 26.99, 'desc': 'Fond de teint lumineux', 'sub': 'Fond de teint'},
-        {'name': 'Infallible Pro-Last Lipstick', 'brand': 'L\'Oréal Paris', 'price': 24.99, 'desc': 'Rouge à lèvres longue tenue', 'sub': 'Rouge à lèvres'},
-        {'name': 'Color Riche Shine Lipstick', 'brand': 'L\'Oréal Paris', 'price': 25.99, 'desc': 'Rouge à lèvres brillant', 'sub': 'Rouge à lèvres'},
-        {'name': 'Voluminous Lash Paradise Mascara', 'brand': 'L\'Oréal Paris', 'price': 28.99, 'desc': 'Mascara volume paradis', 'sub': 'Mascara'},
-        {'name': 'Brow Stylist', 'brand': 'L\'Oréal Paris', 'price': 23.99, 'desc': 'Stylo sourcils', 'sub': 'Fond de teint'},
-        {'name': 'Infallible Pro-Spray & Set', 'brand': 'L\'Oréal Paris', 'price': 26.99, 'desc': 'Fixateur maquillage', 'sub': 'Fond de teint'},
-    ],
-    'soins-corps': [
-        {'name': 'The Ritual of Namaste Body Cream', 'brand': 'Rituals', 'price': 34.95, 'desc': 'Crème corps ayurvédique', 'sub': 'Lotions hydratantes'},
-        {'name': 'The Ritual of Sakura Body Cream', 'brand': 'Rituals', 'price': 32.95, 'desc': 'Crème corps cerisier', 'sub': 'Lotions hydratantes'},
-        {'name': 'The Ritual of Karma Body Cream', 'brand': 'Rituals', 'price': 36.95, 'desc': 'Crème corps karma', 'sub': 'Lotions hydratantes'},
-        {'name': 'The Ritual of Ayurveda Body Cream', 'brand': 'Rituals', 'price': 35.95, 'desc': 'Crème corps ayurvéda', 'sub': 'Lotions hydratantes'},
-        {'name': 'The Ritual of Hammam Body Scrub', 'brand': 'Rituals', 'price': 38.95, 'desc': 'Gommage corps hammam', 'sub': 'Gommages'},
-        {'name': 'The Ritual of Namaste Body Scrub', 'brand': 'Rituals', 'price': 36.95, 'desc': 'Gommage corps ayurvédique', 'sub': 'Gommages'},
-        {'name': 'The Ritual of Sakura Body Scrub', 'brand': 'Rituals', 'price': 34.95, 'desc': 'Gommage corps cerisier', 'sub': 'Gommages'},
-        {'name': 'The Ritual of Karma Body Scrub', 'brand': 'Rituals', 'price': 37.95, 'desc': 'Gommage corps karma', 'sub': 'Gommages'},
-        {'name': 'The Ritual of Ayurveda Body Scrub', 'brand': 'Rituals', 'price': 35.95, 'desc': 'Gommage corps ayurvéda', 'sub': 'Gommages'},
-        {'name': 'The Ritual of Namaste Body Oil', 'brand': 'Rituals', 'price': 39.95, 'desc': 'Huile corps ayurvédique', 'sub': 'Huiles'},
-        {'name': 'The Ritual of Sakura Body Oil', 'brand': 'Rituals', 'price': 37.95, 'desc': 'Huile corps cerisier', 'sub': 'Huiles'},
-        {'name': 'The Ritual of Karma Body Oil', 'brand': 'Rituals', 'price': 41.95, 'desc': 'Huile corps karma', 'sub': 'Huiles'},
-        {'name': 'The Ritual of Ayurveda Body Oil', 'brand': 'Rituals', 'price': 38.95, 'desc': 'Huile corps ayurvéda', 'sub': 'Huiles'},
-        {'name': 'The Ritual of Hammam Body Oil', 'brand': 'Rituals', 'price': 40.95, 'desc': 'Huile corps hammam', 'sub': 'Huiles'},
-        {'name': 'Nivea Body Lotion', 'brand': 'Nivea', 'price': 22.99, 'desc': 'Lotion corps hydratante', 'sub': 'Lotions hydratantes'},
-        {'name': 'Nivea Rich Nourishing Body Lotion', 'brand': 'Nivea', 'price': 24.99, 'desc': 'Lotion corps nourrissante', 'sub': 'Lotions hydratantes'},
-        {'name': 'Nivea Soft Moisturising Cream', 'brand': 'Nivea', 'price': 23.99, 'desc': 'Crème corps douce', 'sub': 'Lotions hydratantes'},
-        {'name': 'Nivea Q10 Plus Firming Body Lotion', 'brand': 'Nivea', 'price': 28.99, 'desc': 'Lotion corps fermeté', 'sub': 'Lotions hydratantes'},
-        {'name': 'Nivea Sun Protect & Moisture', 'brand': 'Nivea', 'price': 26.99, 'desc': 'Crème solaire hydratante', 'sub': 'Lotions hydratantes'},
-        {'name': 'Nivea Sun Protect & Refresh', 'brand': 'Nivea', 'price': 27.99, 'desc': 'Spray solaire rafraîchissant', 'sub': 'Lotions hydratantes'},
-        {'name': 'Garnier Body Intensive 7 Days', 'brand': 'Garnier', 'price': 21.99, 'desc': 'Lotion corps 7 jours', 'sub': 'Lotions hydratantes'},
-        {'name': 'Garnier Body Intensive Repair', 'brand': 'Garnier', 'price': 23.99, 'desc': 'Lotion corps réparatrice', 'sub': 'Lotions hydratantes'},
-        {'name': 'Garnier Body Intensive Nourishing', 'brand': 'Garnier', 'price': 22.99, 'desc': 'Lotion corps nourrissante', 'sub': 'Lotions hydratantes'},
-        {'name': 'Garnier Body Intensive Smoothing', 'brand': 'Garnier', 'price': 24.99, 'desc': 'Lotion corps lissante', 'sub': 'Lotions hydratantes'},
-        {'name': 'Garnier Body Intensive Firming', 'brand': 'Garnier', 'price': 25.99, 'desc': 'Lotion corps fermeté', 'sub': 'Lotions hydratantes'},
-        {'name': 'Garnier Body Intensive Anti-Age', 'brand': 'Garnier', 'price': 26.99, 'desc': 'Lotion corps anti-âge', 'sub': 'Lotions hydratantes'},
-        {'name': 'Garnier Body Intensive Sun Protection', 'brand': 'Garnier', 'price': 27.99, 'desc': 'Protection solaire corps', 'sub': 'Lotions hydratantes'},
-        {'name': 'Garnier Body Intensive After Sun', 'brand': 'Garnier', 'price': 23.99, 'desc': 'Après-soleil apaisant', 'sub': 'Lotions hydratantes'},
-        {'name': 'Garnier Body Intensive Exfoliating', 'brand': 'Garnier', 'price': 24.99, 'desc': 'Gommage corps exfoliant', 'sub': 'Gommages'},
-        {'name': 'Garnier Body Intensive Hand Cream', 'brand': 'Garnier', 'price': 22.99, 'desc': 'Crème mains intensive', 'sub': 'Soins des mains'},
-    ],
-    'cheveux': [
-        {'name': 'Elvive Total Repair 5', 'brand': 'L\'Oréal Paris', 'price': 24.99, 'desc': 'Shampoing réparateur 5 actions', 'sub': 'Shampoings'},
-        {'name': 'Elvive Dream Lengths', 'brand': 'L\'Oréal Paris', 'price': 26.99, 'desc': 'Shampoing longueur rêve', 'sub': 'Shampoings'},
-        {'name': 'Elvive Extraordinary Oil', 'brand': 'L\'Oréal Paris', 'price': 28.99, 'desc': 'Huile capillaire extraordinaire', 'sub': 'Soins coiffants'},
-        {'name': 'Elvive Color Vibrancy', 'brand': 'L\'Oréal Paris', 'price': 27.99, 'desc': 'Shampoing cheveux colorés', 'sub': 'Shampoings'},
-        {'name': 'Elvive Volume Filler', 'brand': 'L\'Oréal Paris', 'price': 25.99, 'desc': 'Shampoing volume', 'sub': 'Shampoings'},
-        {'name': 'Elvive Smooth Intense', 'brand': 'L\'Oréal Paris', 'price': 24.99, 'desc': 'Shampoing lissant intense', 'sub': 'Shampoings'},
-        {'name': 'Elvive Nutri-Gloss', 'brand': 'L\'Oréal Paris', 'price': 23.99, 'desc': 'Shampoing brillance nutritif', 'sub': 'Shampoings'},
-        {'name': 'Elvive Fibrology', 'brand': 'L\'Oréal Paris', 'price': 29.99, 'desc': 'Shampoing densité', 'sub': 'Shampoings'},
-        {'name': 'Elvive Hyaluron Plump', 'brand': 'L\'Oréal Paris', 'price': 27.99, 'desc': 'Shampoing hydratant hyaluron', 'sub': 'Shampoings'},
-        {'name': 'Elvive Wonder Water', 'brand': 'L\'Oréal Paris', 'price': 30.99, 'desc': 'Traitement capillaire eau', 'sub': 'Masques'},
-        {'name': 'Ultra Doux Shampoo', 'brand': 'Garnier', 'price': 21.99, 'desc': 'Shampoing ultra doux', 'sub': 'Shampoings'},
-        {'name': 'Ultra Doux Conditioner', 'brand': 'Garnier', 'price': 22.99, 'desc': 'Après-shampoing ultra doux', 'sub': 'Après-shampoings'},
-        {'name': 'Ultra Doux Hair Mask', 'brand': 'Garnier', 'price': 24.99, 'desc': 'Masque capillaire ultra doux', 'sub': 'Masques'},
-        {'name': 'Ultra Doux Oil', 'brand': 'Garnier', 'price': 23.99, 'desc': 'Huile capillaire ultra doux', 'sub': 'Soins coiffants'},
-        {'name': 'Fructis Strength & Shine', 'brand': 'Garnier', 'price': 22.99, 'desc': 'Shampoing force brillance', 'sub': 'Shampoings'},
-        {'name': 'Fructis Smooth & Shine', 'brand': 'Garnier', 'price': 23.99, 'desc': 'Shampoing lissant brillance', 'sub': 'Shampoings'},
-        {'name': 'Fructis Volume & Body', 'brand': 'Garnier', 'price': 24.99, 'desc': 'Shampoing volume', 'sub': 'Shampoings'},
-        {'name': 'Fructis Color Shield', 'brand': 'Garnier', 'price': 25.99, 'desc': 'Shampoing protection couleur', 'sub': 'Shampoings'},
-        {'name': 'Fructis Repair & Shine', 'brand': 'Garnier', 'price': 26.99, 'desc': 'Shampoing réparation brillance', 'sub': 'Shampoings'},
-        {'name': 'Fructis Hydrating', 'brand': 'Garnier', 'price': 23.99, 'desc': 'Shampoing hydratant', 'sub': 'Shampoings'},
-        {'name': 'Nivea Hair Care Shampoo', 'brand': 'Nivea', 'price': 22.99, 'desc': 'Shampoing soin cheveux', 'sub': 'Shampoings'},
-        {'name': 'Nivea Hair Care Conditioner', 'brand': 'Nivea', 'price': 23.99, 'desc': 'Après-shampoing soin', 'sub': 'Après-shampoings'},
-        {'name': 'Nivea Hair Care Hair Mask', 'brand': 'Nivea', 'price': 25.99, 'desc': 'Masque capillaire soin', 'sub': 'Masques'},
-        {'name': 'Nivea Hair Care Oil', 'brand': 'Nivea', 'price': 24.99, 'desc': 'Huile capillaire soin', 'sub': 'Soins coiffants'},
-        {'name': 'The Ritual of Namaste Shampoo', 'brand': 'Rituals', 'price': 34.95, 'desc': 'Shampoing ayurvédique', 'sub': 'Shampoings'},
-        {'name': 'The Ritual of Sakura Shampoo', 'brand': 'Rituals', 'price': 32.95, 'desc': 'Shampoing cerisier', 'sub': 'Shampoings'},
-        {'name': 'The Ritual of Karma Shampoo', 'brand': 'Rituals', 'price': 36.95, 'desc': 'Shampoing karma', 'sub': 'Shampoings'},
-        {'name': 'The Ritual of Ayurveda Shampoo', 'brand': 'Rituals', 'price': 35.95, 'desc': 'Shampoing ayurvéda', 'sub': 'Shampoings'},
-        {'name': 'The Ritual of Hammam Shampoo', 'brand': 'Rituals', 'price': 37.95, 'desc': 'Shampoing hammam', 'sub': 'Shampoings'},
-        {'name': 'The Ritual of Namaste Conditioner', 'brand': 'Rituals', 'price': 34.95, 'desc': 'Après-shampoing ayurvédique', 'sub': 'Après-shampoings'},
-    ],
-    'parfums': [
-        {'name': 'The Ritual of Namaste Eau de Parfum', 'brand': 'Rituals', 'price': 49.95, 'desc': 'Parfum ayurvédique'},
-        {'name': 'The Ritual of Sakura Eau de Parfum', 'brand': 'Rituals', 'price': 47.95, 'desc': 'Parfum cerisier'},
-        {'name': 'The Ritual of Karma Eau de Parfum', 'brand': 'Rituals', 'price': 51.95, 'desc': 'Parfum karma'},
-        {'name': 'The Ritual of Ayurveda Eau de Parfum', 'brand': 'Rituals', 'price': 49.95, 'desc': 'Parfum ayurvéda'},
-        {'name': 'The Ritual of Hammam Eau de Parfum', 'brand': 'Rituals', 'price': 50.95, 'desc': 'Parfum hammam'},
-        {'name': 'The Ritual of Namaste Body Mist', 'brand': 'Rituals', 'price': 34.95, 'desc': 'Brume parfumée ayurvédique'},
-        {'name': 'The Ritual of Sakura Body Mist', 'brand': 'Rituals', 'price': 32.95, 'desc': 'Brume parfumée cerisier'},
-        {'name': 'The Ritual of Karma Body Mist', 'brand': 'Rituals', 'price': 36.95, 'desc': 'Brume parfumée karma'},
-        {'name': 'The Ritual of Ayurveda Body Mist', 'brand': 'Rituals', 'price': 35.95, 'desc': 'Brume parfumée ayurvéda'},
-        {'name': 'The Ritual of Hammam Body Mist', 'brand': 'Rituals', 'price': 37.95, 'desc': 'Brume parfumée hammam'},
-        {'name': 'Nivea Deodorant', 'brand': 'Nivea', 'price': 21.99, 'desc': 'Déodorant protection'},
-        {'name': 'Nivea Roll-On', 'brand': 'Nivea', 'price': 22.99, 'desc': 'Déodorant roll-on'},
-        {'name': 'Nivea Spray', 'brand': 'Nivea', 'price': 23.99, 'desc': 'Déodorant spray'},
-        {'name': 'Garnier Deodorant', 'brand': 'Garnier', 'price': 21.99, 'desc': 'Déodorant fraîcheur'},
-        {'name': 'Garnier Roll-On', 'brand': 'Garnier', 'price': 22.99, 'desc': 'Déodorant roll-on'},
-        {'name': 'Garnier Spray', 'brand': 'Garnier', 'price': 23.99, 'desc': 'Déodorant spray'},
-        {'name': 'L\'Oréal Paris Deodorant', 'brand': 'L\'Oréal Paris', 'price': 24.99, 'desc': 'Déodorant protection'},
-        {'name': 'L\'Oréal Paris Roll-On', 'brand': 'L\'Oréal Paris', 'price': 25.99, 'desc': 'Déodorant roll-on'},
-        {'name': 'L\'Oréal Paris Spray', 'brand': 'L\'Oréal Paris', 'price': 26.99, 'desc': 'Déodorant spray'},
-        {'name': 'Maybelline Deodorant', 'brand': 'Maybelline', 'price': 21.99, 'desc': 'Déodorant fraîcheur'},
-        {'name': 'Maybelline Roll-On', 'brand': 'Maybelline', 'price': 22.99, 'desc': 'Déodorant roll-on'},
-        {'name': 'Maybelline Spray', 'brand': 'Maybelline', 'price': 23.99, 'desc': 'Déodorant spray'},
-        {'name': 'The Ordinary Deodorant', 'brand': 'The Ordinary', 'price': 24.90, 'desc': 'Déodorant naturel'},
-        {'name': 'The Inkey List Deodorant', 'brand': 'The Inkey List', 'price': 23.90, 'desc': 'Déodorant pur'},
-        {'name': 'Rituals Deodorant', 'brand': 'Rituals', 'price': 28.95, 'desc': 'Déodorant rituel'},
-        {'name': 'Rituals Roll-On', 'brand': 'Rituals', 'price': 29.95, 'desc': 'Déodorant roll-on'},
-        {'name': 'Rituals Spray', 'brand': 'Rituals', 'price': 30.95, 'desc': 'Déodorant spray'},
-        {'name': 'Rituals Body Mist', 'brand': 'Rituals', 'price': 32.95, 'desc': 'Brume parfumée'},
-        {'name': 'Rituals Eau de Toilette', 'brand': 'Rituals', 'price': 44.95, 'desc': 'Eau de toilette'},
-        {'name': 'Rituals Eau de Cologne', 'brand': 'Rituals', 'price': 42.95, 'desc': 'Eau de cologne'},
-    ],
-    'accessoires': [
-        {'name': 'Makeup Brush Set', 'brand': 'Real Techniques', 'price': 34.99, 'desc': 'Set pinceaux maquillage'},
-        {'name': 'Beauty Sponge', 'brand': 'Real Techniques', 'price': 21.99, 'desc': 'Éponge beauté'},
-        {'name': 'Makeup Mirror LED', 'brand': 'Simplehuman', 'price': 89.99, 'desc': 'Miroir maquillage LED'},
-        {'name': 'Brush Holder', 'brand': 'Real Techniques', 'price': 24.99, 'desc': 'Porte-pinceaux'},
-        {'name': 'Makeup Organizer', 'brand': 'Simplehuman', 'price': 49.99, 'desc': 'Organisateur maquillage'},
-        {'name': 'Makeup Bag', 'brand': 'Real Techniques', 'price': 22.99, 'desc': 'Trousse maquillage'},
-        {'name': 'Brush Cleaner', 'brand': 'Real Techniques', 'price': 23.99, 'desc': 'Nettoyant pinceaux'},
-        {'name': 'Makeup Remover Cloths', 'brand': 'Real Techniques', 'price': 21.99, 'desc': 'Lingettes démaquillantes'},
-        {'name': 'Eyelash Curler', 'brand': 'Tweezerman', 'price': 28.99, 'desc': 'Recourbe-cils'},
-        {'name': 'Tweezers', 'brand': 'Tweezerman', 'price': 26.99, 'desc': 'Pince à épiler'},
-        {'name': 'Nail Clipper Set', 'brand': 'Tweezerman', 'price': 24.99, 'desc': 'Coupe-ongles'},
-        {'name': 'Hair Brush', 'brand': 'Tangle Teezer', 'price': 25.99, 'desc': 'Brosse cheveux'},
-        {'name': 'Detangling Brush', 'brand': 'Tangle Teezer', 'price': 26.99, 'desc': 'Brosse démêlante'},
-        {'name': 'Hair Dryer', 'brand': 'Remington', 'price': 89.99, 'desc': 'Sèche-cheveux'},
-        {'name': 'Straightening Iron', 'brand': 'Remington', 'price': 79.99, 'desc': 'Lisseur'},
-        {'name': 'Curling Iron', 'brand': 'Remington', 'price': 69.99, 'desc': 'Fer à boucler'},
-        {'name': 'Hair Clips', 'brand': 'Goody', 'price': 21.99, 'desc': 'Pinces à cheveux'},
-        {'name': 'Hair Ties', 'brand': 'Goody', 'price': 22.99, 'desc': 'Élastiques cheveux'},
-        {'name': 'Hair Scrunchie', 'brand': 'Goody', 'price': 23.99, 'desc': 'Chouchou'},
-        {'name': 'Hair Band', 'brand': 'Goody', 'price': 24.99, 'desc': 'Bandeau cheveux'},
-        {'name': 'Makeup Palette', 'brand': 'Z Palette', 'price': 34.99, 'desc': 'Palette maquillage'},
-        {'name': 'Brush Set Pro', 'brand': 'Zoeva', 'price': 89.99, 'desc': 'Set pinceaux pro'},
-        {'name': 'Beauty Blender', 'brand': 'Beautyblender', 'price': 28.99, 'desc': 'Éponge beauté'},
-        {'name': 'Makeup Sponge Set', 'brand': 'Beautyblender', 'price': 49.99, 'desc': 'Set éponges'},
-        {'name': 'Brush Cleaner Mat', 'brand': 'Sigma', 'price': 29.99, 'desc': 'Tapis nettoyant'},
-        {'name': 'Makeup Brush Set', 'brand': 'Sigma', 'price': 79.99, 'desc': 'Set pinceaux'},
-        {'name': 'Beauty Sponge', 'brand': 'Sigma', 'price': 24.99, 'desc': 'Éponge beauté'},
-        {'name': 'Makeup Mirror', 'brand': 'Conair', 'price': 59.99, 'desc': 'Miroir maquillage'},
-        {'name': 'LED Mirror', 'brand': 'Conair', 'price': 69.99, 'desc': 'Miroir LED'},
-        {'name': 'Travel Mirror', 'brand': 'Conair', 'price': 29.99, 'desc': 'Miroir voyage'},
-    ]
-}
+from catalog import iter_categories, iter_rows
+from catalog.indexes import ProductIndexBuilder
+from catalog.derivatives import DEFAULT_CACHE_DIR, DerivativeStage, supported_formats
+from catalog.images import DEFAULT_IMAGES_DIR, ImageIndex, ImageResolver, image_path
+from catalog.incremental import code_digest, content_digest, default_manifest_path, write_incremental
+from catalog.instrumentation import build_report, metrics, profile_call
+from catalog.locales import (DEFAULT_TRANSLATIONS_PATH, LOCALES, LONG_DESCRIPTION_SUFFIXES, SOURCE_LOCALE,
+                             TranslationCache, locale_path, localize_rows, resolve_translations, translate)
+from catalog.output import open_output, write_chunks, write_chunks_if_changed
+from catalog.recommendations import RecommendationBuilder
+from catalog.search import SearchIndexBuilder
+from catalog.snapshot import SnapshotBuilder
+from catalog.text import token_cache_info
 
-# Générer le code TypeScript
-ts_code = '''import { Product, Category, Review } from '@/types';
+DEFAULT_INPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'catalog', 'products.jsonl')
 
-/**
- * Convertit un nom de produit en nom de fichier image
- */
-function productNameToImageName(name: string): string {
-  return name
-    .toLowerCase()
-    .trim()
-    .replace(/\\s+/g, '_')
-    .replace(/[^a-z0-9_àáâãäåèéêëìíîïòóôõöùúûüýÿç]/gi, '')
-    .replace(/_{2,}/g, '_')
-    .replace(/^_|_$/g, '') + '.jpg';
-}
-
-/**
- * Génère le chemin vers l'image d'un produit
- */
-function getProductImagePath(productName: string): string {
-  return `/image-products/${productNameToImageName(productName)}`;
-}
-
-export const categories: Category[] = [
+# Générer le code TypeScript
+# Les appels getProductImagePath(...) sont remplacés à la génération par le chemin résolu (render_categories)
+TS_CATEGORIES = '''export const categories: Category[] = [
   {
     id: '1',
     name: 'Soins du visage',
@@ -266,41 +72,9 @@ export const categories: Category[] = [
     image: getProductImagePath('Accessoires beauté')
   },
 ];
-
-export const products: Product[] = [
 '''
 
-product_id = 1
-for cat_slug, cat_products in products_data.items():
-    ts_code += f'  // {cat_slug.upper().replace("-", " ")}\n'
-    for p in cat_products:
-        image_name = f"{p['name']} {p['brand']}"
-        rating = round(4.0 + (product_id % 10) * 0.1, 1)
-        reviews = (product_id % 500) + 50
-        is_best = product_id % 7 == 0
-        
-        ts_code += f'''  {{
-    id: '{product_id}',
-    name: '{p["name"]}',
-    description: '{p["desc"]}',
-    longDescription: '{p["desc"]}. Produit de qualité professionnelle disponible aux Pays-Bas.',
-    price: {p["price"]},
-    image: getProductImagePath('{image_name}'),
-    category: '{cat_slug}',
-    subCategory: '{p.get("sub", "")}',
-    brand: '{p["brand"]}',
-    rating: {rating},
-    reviewsCount: {reviews},
-    inStock: true,
-    isBestSeller: {str(is_best).lower()},
-    badges: {['Bestseller'] if is_best else []}
-  }},
-'''
-        product_id += 1
-
-ts_code += '''];
-
-export const reviews: Review[] = [
+TS_REVIEWS = '''export const reviews: Review[] = [
   {
     id: '1',
     productId: '1',
@@ -349,4 +123,480 @@ export const reviews: Review[] = [
 ];
 '''
 
-print(ts_code)
+
+# Sortie découpée par catégorie (--shard-dir)
+SHARD_HEADER = '''import { Product } from '@/types';
+
+export const products: Product[] = [
+'''
+
+SHARD_FOOTER = '];\n'
+
+
+SHARD_INDEX_LOADER = '''
+/**
+ * Charge uniquement le module des produits d'une catégorie
+ */
+export function loadCategoryProducts(slug: string): Promise<Product[]> {
+  const load = productLoaders[slug];
+  return load ? load() : Promise.resolve([]);
+}
+'''
+
+
+def ts_imports(with_indexes):
+    types = 'Product, Category, Review, ProductIndexes' if with_indexes else 'Product, Category, Review'
+    return f"import {{ {types} }} from '@/types';\n"
+
+
+_IMAGE_CALL_RE = re.compile(r"getProductImagePath\('([^']*)'\)")
+_SUB_CATEGORIES_RE = re.compile(r'subCategories: \[([^\]]*)\]')
+_TS_STRING_RE = re.compile(r"'([^']*)'")
+_CATEGORY_NAME_RE = re.compile(r"name: '([^']*)',\s*slug: '([^']*)'")
+
+
+def category_names():
+    """Noms des catégories du bloc des catégories, par slug (indexés par la recherche)."""
+    return {slug: name for name, slug in _CATEGORY_NAME_RE.findall(TS_CATEGORIES)}
+
+
+def category_sub_categories():
+    """Sous-catégories citées dans le bloc des catégories, à traduire avec celles des produits."""
+    return [text for m in _SUB_CATEGORIES_RE.finditer(TS_CATEGORIES) for text in _TS_STRING_RE.findall(m[1])]
+
+
+def render_categories(image_index=None, translations=None):
+    """Bloc des catégories avec leurs chemins d'images calculés une fois pour toutes.
+
+    `translations` (table d'une langue) traduit les sous-catégories comme le champ
+    subCategory des produits, pour que les filtres par sous-catégorie correspondent.
+    """
+    block = _IMAGE_CALL_RE.sub(lambda m: f"'{image_path(m[1], image_index)}'", TS_CATEGORIES)
+    if translations:
+        def translate_list(m):
+            names = _TS_STRING_RE.sub(lambda s: f"'{translate(translations, s[1])}'", m[1])
+            return f'subCategories: [{names}]'
+        block = _SUB_CATEGORIES_RE.sub(translate_list, block)
+    return block
+
+
+def ts_header(with_indexes=False, image_index=None, translations=None):
+    return (ts_imports(with_indexes) + '\n' + render_categories(image_index, translations)
+            + '\nexport const products: Product[] = [\n')
+
+
+def ts_footer(indexes=None):
+    index_block = indexes.render_ts() + '\n' if indexes is not None else ''
+    return '];\n\n' + index_block + TS_REVIEWS + '\n'
+
+
+LONG_DESCRIPTION_SUFFIX = LONG_DESCRIPTION_SUFFIXES[SOURCE_LOCALE]
+
+
+def is_best_seller(product_id):
+    return product_id % 7 == 0
+
+
+def product_metrics(product_id):
+    """Note et nombre d'avis affichés pour un produit."""
+    return round(4.0 + (product_id % 10) * 0.1, 1), (product_id % 500) + 50
+
+
+def render_product(product_id, cat_slug, p, image, srcset=None):
+    """Rend un produit sous forme de littéral TypeScript.
+
+    `image` est le chemin de l'image, déjà résolu ; `srcset` (format -> srcset des
+    déclinaisons responsives) ajoute le champ imageSrcSet. `p['long_desc']`, fourni
+    par les catalogues localisés, remplace la description longue par défaut.
+    """
+    rating, reviews = product_metrics(product_id)
+    is_best = is_best_seller(product_id)
+
+    return f'''  {{
+    id: '{product_id}',
+    name: '{p["name"]}',
+    description: '{p["desc"]}',
+    longDescription: '{p.get("long_desc") or p["desc"] + LONG_DESCRIPTION_SUFFIX}',
+    price: {p["price"]},
+    image: '{image}',{render_srcset(srcset)}
+    category: '{cat_slug}',
+    subCategory: '{p.get("sub", "")}',
+    brand: '{p["brand"]}',
+    rating: {rating},
+    reviewsCount: {reviews},
+    inStock: true,
+    isBestSeller: {str(is_best).lower()},
+    badges: {['Bestseller'] if is_best else []}
+  }},
+'''
+
+
+def render_srcset(srcset):
+    if not srcset:
+        return ''
+    entries = ', '.join(f"{fmt}: '{value}'" for fmt, value in srcset.items())
+    return f'\n    imageSrcSet: {{ {entries} }},'
+
+
+def product_part(product_id, cat_slug, p, derivatives=None, image_index=None):
+    """Morceau `(clé, section, empreinte, rendu)` d'un produit."""
+    image = image_path(f"{p['name']} {p['brand']}", image_index)
+    srcset = derivatives.srcset_for(p) if derivatives is not None else None
+    return (f'product:{product_id}', cat_slug, content_digest(product_id, cat_slug, p, image, srcset),
+            lambda: render_product(product_id, cat_slug, p, image, srcset))
+
+
+def static_part(key, text, section=None):
+    return key, section, content_digest(text), lambda: text
+
+
+def collect(collectors, product_id, cat_slug, p):
+    """Transmet un produit aux étapes qui l'accumulent (index, recommandations…)."""
+    is_best = is_best_seller(product_id)
+    metrics.count(f'products.{cat_slug}')
+    for collector in collectors:
+        collector.add(product_id, cat_slug, p, is_best)
+
+
+def iter_ts_parts(rows, indexes=None, collectors=(), derivatives=None, image_index=None, translations=None):
+    """Découpe lib/data.ts en morceaux `(clé, section, empreinte, rendu)`.
+
+    L'empreinte ne dépend que de la source du morceau, ce qui permet au mode
+    incrémental de savoir sans le rendre si un morceau a changé. Chaque produit
+    est aussi transmis aux `collectors` ; `indexes`, s'il est fourni, en fait
+    partie et est émis après le tableau des produits. Les chemins d'images sont
+    résolus dans `image_index` (ImageIndex) s'il est fourni ; `translations`
+    traduit les sous-catégories du bloc des catégories.
+    """
+    yield static_part('header', ts_header(indexes is not None, image_index, translations))
+    product_id = 1
+    for cat_slug, cat_products in iter_categories(rows):
+        yield static_part(f'section:{cat_slug}', f'  // {cat_slug.upper().replace("-", " ")}\n', cat_slug)
+        for p in cat_products:
+            collect(collectors, product_id, cat_slug, p)
+            yield product_part(product_id, cat_slug, p, derivatives, image_index)
+            product_id += 1
+    yield static_part('footer', ts_footer(indexes))
+
+
+def iter_ts_chunks(rows, indexes=None, collectors=(), derivatives=None, image_index=None, translations=None):
+    """Produit le fichier lib/data.ts morceau par morceau, sans jamais le construire en entier."""
+    for _key, _section, _digest, render in iter_ts_parts(rows, indexes, collectors, derivatives, image_index,
+                                                         translations):
+        yield render()
+
+
+def write_snapshot(rows, path, collectors=(), image_index=None, long_description_suffix=LONG_DESCRIPTION_SUFFIX):
+    """Écrit l'instantané colonnaire JSON du catalogue au lieu du module TypeScript."""
+    snapshot = SnapshotBuilder(product_metrics, long_description_suffix, image_index)
+    collectors = [snapshot, *collectors]
+    product_id = 1
+    for cat_slug, cat_products in iter_categories(rows):
+        for p in cat_products:
+            collect(collectors, product_id, cat_slug, p)
+            product_id += 1
+    if path:
+        write_chunks_if_changed(path, snapshot.iter_json_chunks())
+    else:
+        with open_output(None) as out:
+            write_chunks(snapshot.iter_json_chunks(), out)
+
+
+def iter_shard_parts(cat_slug, cat_products, ids, counts, collectors=(), derivatives=None, image_index=None):
+    """Morceaux du module d'une seule catégorie ; les ids restent globaux au catalogue."""
+    yield static_part('header', SHARD_HEADER)
+    for p in cat_products:
+        product_id = next(ids)
+        counts[cat_slug] = counts.get(cat_slug, 0) + 1
+        collect(collectors, product_id, cat_slug, p)
+        yield product_part(product_id, cat_slug, p, derivatives, image_index)
+    yield static_part('footer', SHARD_FOOTER)
+
+
+def render_shard_index(counts, indexes=None, image_index=None, translations=None):
+    """Module index : catégories, nombre de produits et chargement paresseux de chaque module.
+
+    Dans `productIndexes.byId`, la position est celle du produit dans la concaténation
+    des modules, dans l'ordre de `productLoaders`.
+    """
+    count_lines = ''.join(f"  '{slug}': {count},\n" for slug, count in counts.items())
+    loader_lines = ''.join(f"  '{slug}': () => import('./{slug}').then((m) => m.products),\n" for slug in counts)
+    index_block = '\n' + indexes.render_ts() if indexes is not None else ''
+    return (ts_imports(indexes is not None) + '\n'
+            + render_categories(image_index, translations)
+            + f'\nexport const productCounts: Record<string, number> = {{\n{count_lines}}};\n'
+            + f'\nexport const productLoaders: Record<string, () => Promise<Product[]>> = {{\n{loader_lines}}};\n'
+            + SHARD_INDEX_LOADER + index_block + '\n' + TS_REVIEWS)
+
+
+def write_sharded(rows, directory, incremental=False, generator=None, indexes=None, collectors=(),
+                  derivatives=None, image_index=None, translations=None):
+    """Écrit un module par catégorie et l'index, et renvoie les statistiques cumulées."""
+    os.makedirs(directory, exist_ok=True)
+    ids = itertools.count(1)
+    counts = {}
+    totals = {'rendered': 0, 'reused': 0, 'changed_sections': [], 'written': False}
+    for cat_slug, cat_products in iter_categories(rows):
+        if cat_slug in counts:
+            raise ValueError(f'catégorie {cat_slug} non contiguë dans la source : triez les lignes par catégorie')
+        path = os.path.join(directory, f'{cat_slug}.ts')
+        parts = iter_shard_parts(cat_slug, cat_products, ids, counts, collectors, derivatives, image_index)
+        if incremental:
+            stats = write_incremental(parts, path, default_manifest_path(path), generator)
+            totals['rendered'] += stats['rendered']
+            totals['reused'] += stats['reused']
+            if stats['written']:
+                totals['changed_sections'].append(cat_slug)
+                totals['written'] = True
+        else:
+            with open_output(path) as out:
+                write_chunks((render() for _key, _section, _digest, render in parts), out)
+    if write_chunks_if_changed(os.path.join(directory, 'index.ts'), [render_shard_index(counts, indexes, image_index, translations)]):
+        totals['written'] = True
+    return totals
+
+
+def report_incremental(target, stats):
+    changed = ', '.join(stats['changed_sections']) or 'aucune'
+    status = 'réécrit' if stats['written'] else 'inchangé'
+    print(f"{target} {status} : {stats['rendered']} morceau(x) rendu(s), "
+          f"{stats['reused']} réutilisé(s) ; sections modifiées : {changed}", file=sys.stderr)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Génère lib/data.ts à partir du catalogue produits.')
+    parser.add_argument('-i', '--input', default=DEFAULT_INPUT,
+                        help='catalogue source : .jsonl, .csv ou base SQLite (.db/.sqlite)')
+    parser.add_argument('--format', choices=('ts', 'snapshot'), default='ts',
+                        help='ts : module TypeScript (défaut) ; snapshot : instantané colonnaire JSON '
+                             'chargé par lib/catalogSnapshot.ts')
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('-o', '--output', help='fichier de sortie (stdout par défaut), écrit de façon atomique')
+    target.add_argument('--shard-dir',
+                        help='écrit un module par catégorie et un index.ts dans ce répertoire au lieu d\'un seul fichier')
+    parser.add_argument('--incremental', action='store_true',
+                        help='ne réémet que les produits modifiés depuis la dernière génération '
+                             '(requiert --output ou --shard-dir)')
+    parser.add_argument('--indexes', action='store_true',
+                        help='émet aussi productIndexes (id, catégorie, marque, sous-catégorie, best-sellers)')
+    parser.add_argument('--recommendations', metavar='PATH',
+                        help='écrit dans PATH les tables de produits similaires et complémentaires précalculées')
+    parser.add_argument('--search-index', metavar='PATH',
+                        help='écrit dans PATH l\'index inversé de recherche (nom, marque, description, sous-catégorie)')
+    parser.add_argument('--image-manifest', metavar='PATH',
+                        help='vérifie les images produits et écrit dans PATH le manifeste JSON '
+                             '(fichiers, dimensions, empreintes, manquantes, doublons)')
+    parser.add_argument('--images-dir', default=DEFAULT_IMAGES_DIR, help='répertoire des images produits')
+    parser.add_argument('-j', '--jobs', type=int, help='nombre de processus pour l\'analyse des images')
+    parser.add_argument('--derivatives', action='store_true',
+                        help='génère les déclinaisons responsives des images et ajoute imageSrcSet aux produits')
+    parser.add_argument('--derivatives-dir', default=DEFAULT_CACHE_DIR,
+                        help='cache adressé par contenu des déclinaisons (servi sous /image-derivatives)')
+    parser.add_argument('--formats', default='webp,avif', help='formats des déclinaisons, séparés par des virgules')
+    parser.add_argument('--manifest', help='manifeste des empreintes (par défaut .<output>.manifest.json)')
+    parser.add_argument('--locales',
+                        help=f'langues à générer en parallèle, séparées par des virgules ({",".join(LOCALES)}) ; '
+                             'écrit data.<langue>.ts à côté de --output ou un sous-répertoire par langue de --shard-dir')
+    parser.add_argument('--translations', default=DEFAULT_TRANSLATIONS_PATH,
+                        help='cache SQLite des traductions, indexé par empreinte du texte source')
+    parser.add_argument('--import-translations', metavar='PATH',
+                        help='importe dans le cache des traductions JSONL {"locale", "source", "text"}')
+    parser.add_argument('--translator', metavar='CMD',
+                        help='commande de traduction appelée pour les seuls textes absents du cache '
+                             '(JSONL sur stdin et stdout, voir catalog/locales.py)')
+    parser.add_argument('--missing-translations', metavar='PATH',
+                        help='exporte en JSONL les textes restés sans traduction, à compléter puis réimporter')
+    parser.add_argument('--stats', action='store_true',
+                        help='affiche sur stderr la durée de chaque étape et les compteurs (produits, octets, cache…)')
+    parser.add_argument('--profile', metavar='PATH',
+                        help='profile la génération et écrit dans PATH un rapport JSON (étapes, compteurs, profil)')
+    parser.add_argument('--profile-mode', choices=('cpu', 'memory'), default='cpu',
+                        help='cpu : cProfile, fonctions par temps cumulé (défaut) ; '
+                             'memory : tracemalloc, pic et lignes qui allouent le plus')
+    args = parser.parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error(f'-j/--jobs doit être un entier strictement positif ({args.jobs})')
+    for flag, value in (('--output', args.output), ('--recommendations', args.recommendations),
+                        ('--search-index', args.search_index), ('--image-manifest', args.image_manifest),
+                        ('--manifest', args.manifest), ('--missing-translations', args.missing_translations),
+                        ('--profile', args.profile)):
+        directory = os.path.dirname(os.path.abspath(value)) if value else None
+        if directory and not os.path.isdir(directory):
+            parser.error(f'{flag} : répertoire de sortie introuvable ({directory})')
+    if args.incremental and not (args.output or args.shard_dir):
+        parser.error('--incremental requiert --output ou --shard-dir')
+    if args.locales:
+        args.locales = list(dict.fromkeys(locale.strip() for locale in args.locales.split(',') if locale.strip()))
+        unknown = [locale for locale in args.locales if locale not in LOCALES]
+        if unknown:
+            parser.error(f"langue(s) inconnue(s) : {', '.join(unknown)} (disponibles : {', '.join(LOCALES)})")
+        if not (args.output or args.shard_dir):
+            parser.error('--locales requiert --output ou --shard-dir')
+        if args.manifest:
+            parser.error('--manifest ne s\'applique pas à --locales (un manifeste par fichier de langue)')
+    if args.format == 'snapshot':
+        for flag, value in (('--shard-dir', args.shard_dir), ('--incremental', args.incremental),
+                            ('--indexes', args.indexes), ('--derivatives', args.derivatives)):
+            if value:
+                parser.error(f'{flag} ne s\'applique qu\'au format ts')
+    for flag, value in (('--image-manifest', args.image_manifest), ('--derivatives', args.derivatives)):
+        if value and not os.path.isdir(args.images_dir):
+            parser.error(f'{flag} : répertoire d\'images introuvable ({args.images_dir})')
+    if args.derivatives:
+        args.formats, skipped = supported_formats([f.strip() for f in args.formats.split(',') if f.strip()])
+        if not args.formats:
+            parser.error('--derivatives requiert Pillow avec le support WebP ou AVIF (pip install Pillow)')
+        if skipped:
+            print(f"déclinaisons : format(s) non supporté(s) ignoré(s) : {', '.join(skipped)}", file=sys.stderr)
+    return args
+
+
+def generator_digest():
+    """Empreinte du générateur et des modules catalog/ qui participent au rendu (suffixes, chemins d'images…)."""
+    package = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'catalog')
+    modules = sorted(os.path.join(package, name) for name in os.listdir(package) if name.endswith('.py'))
+    return code_digest(os.path.abspath(__file__), *modules)
+
+
+def emit(args, rows, output, shard_dir, indexes=None, collectors=(), derivatives=None, image_index=None,
+         long_description_suffix=LONG_DESCRIPTION_SUFFIX, translations=None):
+    """Écrit le catalogue dans `output` ou `shard_dir` selon le format et le mode demandés."""
+    if args.format == 'snapshot':
+        write_snapshot(rows, output, collectors, image_index, long_description_suffix)
+    elif shard_dir:
+        stats = write_sharded(rows, shard_dir, args.incremental, generator_digest(), indexes, collectors,
+                              derivatives, image_index, translations)
+        if args.incremental:
+            report_incremental(shard_dir, stats)
+    elif args.incremental:
+        manifest_path = args.manifest or default_manifest_path(output)
+        parts = iter_ts_parts(rows, indexes, collectors, derivatives, image_index, translations)
+        report_incremental(output, write_incremental(parts, output, manifest_path, generator_digest()))
+    else:
+        with open_output(output) as out:
+            write_chunks(iter_ts_chunks(rows, indexes, collectors, derivatives, image_index, translations), out)
+
+
+# Catalogue analysé et étapes d'images, transmis une fois à chaque processus du pool des langues
+_LOCALE_CONTEXT = {}
+
+
+def init_locale_worker(rows, image_index, derivatives):
+    _LOCALE_CONTEXT.update(rows=rows, image_index=image_index, derivatives=derivatives)
+
+
+def build_locale(task):
+    """Génère le catalogue d'une langue (exécuté dans un processus du pool) et renvoie ses métriques."""
+    locale, table, args = task
+    metrics.reset()
+    rows = localize_rows(_LOCALE_CONTEXT['rows'], locale, table)
+    output = locale_path(args.output, locale) if args.output else None
+    shard_dir = os.path.join(args.shard_dir, locale) if args.shard_dir else None
+    indexes = ProductIndexBuilder() if args.indexes else None
+    emit(args, iter(rows), output, shard_dir, indexes, [indexes] if indexes is not None else [],
+         _LOCALE_CONTEXT['derivatives'], _LOCALE_CONTEXT['image_index'], LONG_DESCRIPTION_SUFFIXES[locale], table)
+    return locale, metrics.as_dict()
+
+
+def build_locales(args, rows, derivatives=None, image_index=None):
+    """Traduit le catalogue puis génère chaque langue en parallèle, à partir des mêmes lignes analysées."""
+    with metrics.stage('translations'), TranslationCache(args.translations) as cache:
+        if args.import_translations:
+            imported = cache.import_jsonl(args.import_translations)
+            print(f'traductions : {imported} entrée(s) importée(s)', file=sys.stderr)
+        tables, missing = resolve_translations(rows, args.locales, cache, args.translator,
+                                               category_sub_categories())
+    if missing:
+        counts = ', '.join(f'{locale} {len(texts)}' for locale, texts in missing.items())
+        print(f'traductions manquantes (texte source conservé) : {counts}', file=sys.stderr)
+        if args.missing_translations:
+            with open_output(args.missing_translations) as out:
+                for locale, texts in missing.items():
+                    for text in texts.values():
+                        out.write(json.dumps({'locale': locale, 'source': text, 'text': ''}, ensure_ascii=False) + '\n')
+
+    jobs = min(len(args.locales), args.jobs or os.cpu_count() or 1)
+    tasks = [(locale, tables[locale], args) for locale in args.locales]
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_locale_worker,
+                             initargs=(rows, image_index, derivatives)) as pool:
+        for locale, locale_metrics in pool.map(build_locale, tasks):
+            metrics.merge(locale_metrics, f'locale.{locale}.')
+
+
+def run(args):
+    rows = metrics.timed_iter('load', iter_rows(args.input))
+    if args.locales:
+        # Lu et analysé une seule fois, puis partagé par toutes les langues
+        rows = list(rows)
+    # Index des images partagé par toutes les étapes : chaque nom n'est résolu qu'une fois
+    image_index = None
+    if os.path.isdir(args.images_dir):
+        with metrics.stage('image-index'):
+            image_index = ImageIndex(args.images_dir)
+    else:
+        print(f'images : {args.images_dir} introuvable, chemins calculés sans vérification', file=sys.stderr)
+    # En multilingue, chaque langue construit ses propres index dans son processus
+    indexes = ProductIndexBuilder() if args.indexes and not args.locales else None
+    # Sorties annexes alimentées pendant le parcours, écrites une fois le catalogue lu
+    side_outputs = []
+    if args.recommendations:
+        recommendations = RecommendationBuilder()
+        side_outputs.append(('recommendations', recommendations, args.recommendations,
+                             recommendations.iter_ts_chunks))
+    if args.search_index:
+        search_index = SearchIndexBuilder(category_names())
+        side_outputs.append(('search-index', search_index, args.search_index, search_index.iter_ts_chunks))
+    images = None
+    if args.image_manifest:
+        images = ImageResolver(args.images_dir, args.jobs, image_index)
+        side_outputs.append(('image-manifest', images, args.image_manifest, images.iter_json_chunks))
+    collectors = [c for c in [indexes] + [builder for _stage, builder, _path, _render in side_outputs]
+                  if c is not None]
+
+    derivatives = None
+    if args.derivatives:
+        with metrics.stage('derivatives'):
+            derivatives = DerivativeStage(args.derivatives_dir, args.images_dir, args.formats, args.jobs,
+                                          image_index).run()
+        print('déclinaisons : {encoded} fichier(s) encodé(s), {cached} source(s) déjà en cache, '
+              '{probed} source(s) analysée(s)'.format(**derivatives.stats), file=sys.stderr)
+
+    if args.locales:
+        with metrics.stage('locales'):
+            build_locales(args, rows, derivatives, image_index)
+        # Les sorties annexes restent construites sur le catalogue source
+        for product_id, (cat_slug, p) in enumerate(((cat_slug, p) for cat_slug, cat_products
+                                                    in iter_categories(iter(rows)) for p in cat_products), 1):
+            collect(collectors, product_id, cat_slug, p)
+    else:
+        # « emit » inclut la lecture du catalogue, mesurée à part sous « load »
+        with metrics.stage('emit'):
+            emit(args, rows, args.output, args.shard_dir, indexes, collectors, derivatives, image_index)
+
+    for stage, _builder, path, render in side_outputs:
+        with metrics.stage(stage):
+            write_chunks_if_changed(path, render())
+    hits, misses = token_cache_info()
+    metrics.count('cache.tokens.hit', hits)
+    metrics.count('cache.tokens.miss', misses)
+    if images is not None:
+        print(f'images : {len(images.products)} produit(s) résolu(s), {len(images.missing)} manquante(s)',
+              file=sys.stderr)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    metrics.reset()
+    if args.profile:
+        _result, profile = profile_call(lambda: run(args), args.profile_mode)
+        with open_output(args.profile) as out:
+            json.dump(build_report(args.profile_mode, profile), out, ensure_ascii=False, indent=2)
+            out.write('\n')
+    else:
+        run(args)
+    if args.stats:
+        print('\n'.join(metrics.summary()), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
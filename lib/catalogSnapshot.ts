@@ -0,0 +1,35 @@
+import { CatalogSnapshot, Product } from '@/types';
+
+/**
+ * Reconstruit les produits à partir de l'instantané colonnaire
+ * généré par generate_products.py (--format snapshot)
+ */
+export function loadProductsFromSnapshot(snapshot: CatalogSnapshot): Product[] {
+  const { strings, columns } = snapshot;
+  const products: Product[] = new Array(snapshot.count);
+
+  for (let i = 0; i < snapshot.count; i++) {
+    const name = columns.name[i];
+    const brand = strings[columns.brand[i]];
+    const isBestSeller = columns.isBestSeller[i] === 1;
+
+    products[i] = {
+      id: String(columns.id[i]),
+      name,
+      description: columns.description[i],
+      longDescription: columns.description[i] + snapshot.longDescriptionSuffix,
+      price: columns.price[i],
+      image: `/image-products/${columns.image[i]}`,
+      category: strings[columns.category[i]],
+      subCategory: strings[columns.subCategory[i]],
+      brand,
+      rating: columns.rating[i],
+      reviewsCount: columns.reviewsCount[i],
+      inStock: true,
+      isBestSeller,
+      badges: isBestSeller ? ['Bestseller'] : [],
+    };
+  }
+
+  return products;
+}
@@ -1,17 +1,5 @@
 import { Product } from '@/types';
-
-/**
- * Convertit un nom de produit en nom de fichier image
- */
-function productNameToImageName(name: string): string {
-  return name
-    .toLowerCase()
-    .trim()
-    .replace(/\s+/g, '_')
-    .replace(/[^a-z0-9_àáâãäåèéêëìíîïòóôõöùúûüýÿç]/gi, '')
-    .replace(/_{2,}/g, '_')
-    .replace(/^_|_$/g, '') + '.jpg';
-}
+import { productNameToImageName } from '@/lib/utils';
 
 /**
  * Crée un produit avec le chemin d'image généré automatiquement
@@ -1,17 +1,70 @@
-import { Product } from '@/types';
+import { Product, ProductIndexes, RecommendationTable } from '@/types';
 
 /**
- * Recommande des produits similaires basés sur la catégorie
+ * Réunit plusieurs listes d'ids issues des index et renvoie les produits
+ * correspondants dans l'ordre du catalogue, sans parcourir tout le tableau
+ */
+function collectIndexed(
+  idLists: (string[] | undefined)[],
+  excluded: Set<string>,
+  allProducts: Product[],
+  indexes: ProductIndexes,
+  limit: number
+): Product[] {
+  const positions = new Set<number>();
+  idLists.forEach(ids => {
+    ids?.forEach(id => {
+      const position = indexes.byId[id];
+      if (position !== undefined && !excluded.has(id)) positions.add(position);
+    });
+  });
+
+  return Array.from(positions)
+    .sort((a, b) => a - b)
+    .slice(0, limit)
+    .map(position => allProducts[position]);
+}
+
+/**
+ * Lit les recommandations précalculées d'un produit : une seule recherche
+ * dans la table au lieu d'un filtrage du catalogue
+ */
+export function getPrecomputedRecommendations(
+  productId: string,
+  kind: keyof RecommendationTable,
+  table: RecommendationTable,
+  allProducts: Product[],
+  indexes: ProductIndexes
+): Product[] {
+  return (table[kind][productId] || [])
+    .map(id => allProducts[indexes.byId[id]])
+    .filter((p): p is Product => p !== undefined);
+}
+
+/**
+ * Recommande des produits similaires basés sur la catégorie ou la marque ;
+ * un produit sans marque ne rapproche que les produits de sa catégorie
  */
 export function getSimilarProducts(
   product: Product,
   allProducts: Product[],
-  limit: number = 4
+  limit: number = 4,
+  indexes?: ProductIndexes
 ): Product[] {
+  if (indexes) {
+    return collectIndexed(
+      [indexes.byCategory[product.category], product.brand ? indexes.byBrand[product.brand] : undefined],
+      new Set([product.id]),
+      allProducts,
+      indexes,
+      limit
+    );
+  }
+
   return allProducts
     .filter(p => 
       p.id !== product.id && 
-      (p.category === product.category || p.brand === product.brand)
+      (p.category === product.category || (product.brand && p.brand === product.brand))
     )
     .slice(0, limit);
 }
@@ -22,27 +75,48 @@ export function getSimilarProducts(
 export function getRecommendedFromHistory(
   purchasedProductIds: string[],
   allProducts: Product[],
-  limit: number = 4
+  limit: number = 4,
+  indexes?: ProductIndexes
 ): Product[] {
   if (purchasedProductIds.length === 0) {
     // Si pas d'historique, retourner les best-sellers
+    if (indexes) {
+      return collectIndexed([indexes.bestSellers], new Set(), allProducts, indexes, limit);
+    }
     return allProducts
       .filter(p => p.isBestSeller)
       .slice(0, limit);
   }
 
+  const purchasedIds = new Set(purchasedProductIds);
+
   // Trouver les catégories et marques des produits achetés
-  const purchasedProducts = allProducts.filter(p => 
-    purchasedProductIds.includes(p.id)
-  );
+  const purchasedProducts = indexes
+    ? purchasedProductIds
+        .map(id => allProducts[indexes.byId[id]])
+        .filter((p): p is Product => p !== undefined)
+    : allProducts.filter(p => purchasedIds.has(p.id));
   
   const categories = new Set(purchasedProducts.map(p => p.category));
   const brands = new Set(purchasedProducts.map(p => p.brand).filter(Boolean));
 
+  if (indexes) {
+    return collectIndexed(
+      [
+        ...Array.from(categories, category => indexes.byCategory[category]),
+        ...Array.from(brands, brand => indexes.byBrand[brand as string]),
+      ],
+      purchasedIds,
+      allProducts,
+      indexes,
+      limit
+    );
+  }
+
   // Recommander des produits de catégories/marques similaires
   return allProducts
     .filter(p => 
-      !purchasedProductIds.includes(p.id) &&
+      !purchasedIds.has(p.id) &&
       (categories.has(p.category) || (p.brand && brands.has(p.brand)))
     )
     .slice(0, limit);
@@ -54,7 +128,8 @@ export function getRecommendedFromHistory(
 export function getComplementaryProducts(
   product: Product,
   allProducts: Product[],
-  limit: number = 3
+  limit: number = 3,
+  indexes?: ProductIndexes
 ): Product[] {
   // Logique basée sur les catégories complémentaires
   const complementaryCategories: Record<string, string[]> = {
@@ -66,6 +141,16 @@ export function getComplementaryProducts(
   };
 
   const complementary = complementaryCategories[product.category] || [];
+
+  if (indexes) {
+    return collectIndexed(
+      [...complementary.map(category => indexes.byCategory[category]), indexes.bestSellers],
+      new Set([product.id]),
+      allProducts,
+      indexes,
+      limit
+    );
+  }
   
   return allProducts
     .filter(p => 
@@ -0,0 +1,145 @@
+import { Category, Product, SearchIndex } from '@/types';
+
+// Masques des champs indexés (voir catalog/search.py) et poids associés,
+// repris de l'ancien scoring de SearchModal : un mot entier du nom vaut
+// « nom commence par » (30 + 20), un début de mot « nom contient » (30)
+const FIELD_BITS = 6;
+const FIELD_NAME = 1;
+const FIELD_BRAND = 2;
+const FIELD_DESC = 4;
+const FIELD_SUB = 8;
+const FIELD_CATEGORY = 16;
+const FIELD_NAME_WORD = 32;
+const MIN_PREFIX_LENGTH = 2;
+const FIELD_WEIGHTS: [number, number][] = [
+  [FIELD_NAME, 30],
+  [FIELD_NAME_WORD, 20],
+  [FIELD_BRAND, 20],
+  [FIELD_DESC, 10],
+  [FIELD_SUB, 5],
+  [FIELD_CATEGORY, 5],
+];
+
+/**
+ * Découpe une requête en jetons sans accents, comme le générateur de l'index
+ */
+export function tokenizeSearchQuery(query: string): string[] {
+  return query
+    .toLowerCase()
+    .normalize('NFD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .split(/[^a-z0-9]+/)
+    .filter(Boolean);
+}
+
+/**
+ * Termes d'un texte : jetons avec et sans apostrophes/tirets, puis leurs préfixes,
+ * associés à `true` pour un mot entier
+ */
+function indexTerms(text: string): Map<string, boolean> {
+  const tokens = new Set([
+    ...tokenizeSearchQuery(text),
+    ...tokenizeSearchQuery(text.replace(/['’‘`ʼ-]/g, '')),
+  ]);
+  const terms = new Map<string, boolean>();
+  tokens.forEach(token => {
+    terms.set(token, true);
+    for (let end = MIN_PREFIX_LENGTH; end < token.length; end++) {
+      const prefix = token.slice(0, end);
+      if (!terms.has(prefix)) terms.set(prefix, false);
+    }
+  });
+  return terms;
+}
+
+/**
+ * Construit l'index au format de catalog/search.py pour un catalogue déjà chargé,
+ * quand aucun index généré ne l'accompagne (lib/data.ts). `categories` fournit
+ * le nom indexé avec le slug de chaque catégorie.
+ */
+export function buildSearchIndex(products: Product[], categories: Category[] = []): SearchIndex {
+  const postingsByTerm = new Map<string, number[]>();
+  const categoryNames = new Map(categories.map(category => [category.slug, category.name]));
+
+  products.forEach((product, position) => {
+    const fields = new Map<string, number>();
+    const texts: [number, string][] = [
+      [FIELD_NAME, product.name],
+      [FIELD_BRAND, product.brand || ''],
+      [FIELD_DESC, product.description],
+      [FIELD_SUB, product.subCategory || ''],
+      [FIELD_CATEGORY, `${product.category} ${categoryNames.get(product.category) || ''}`],
+    ];
+    texts.forEach(([field, text]) => {
+      const wordBonus = field === FIELD_NAME ? FIELD_NAME_WORD : 0;
+      indexTerms(text).forEach((whole, term) => {
+        fields.set(term, (fields.get(term) || 0) | field | (whole ? wordBonus : 0));
+      });
+    });
+    fields.forEach((mask, term) => {
+      const postings = postingsByTerm.get(term);
+      const posting = (position << FIELD_BITS) | mask;
+      if (postings) postings.push(posting);
+      else postingsByTerm.set(term, [posting]);
+    });
+  });
+
+  // Termes ASCII : l'ordre par défaut est celui de sorted() côté Python
+  const terms = Array.from(postingsByTerm.keys()).sort();
+  return {
+    ids: products.map(product => product.id),
+    terms,
+    postings: terms.map(term => postingsByTerm.get(term)!),
+  };
+}
+
+/**
+ * Recherche dichotomique d'un terme dans la table triée
+ */
+function findTerm(terms: string[], term: string): number {
+  let low = 0;
+  let high = terms.length - 1;
+  while (low <= high) {
+    const mid = (low + high) >> 1;
+    if (terms[mid] === term) return mid;
+    if (terms[mid] < term) low = mid + 1;
+    else high = mid - 1;
+  }
+  return -1;
+}
+
+/**
+ * Renvoie les ids des produits correspondant à la requête, par pertinence,
+ * en quelques recherches dans l'index au lieu d'un parcours du catalogue.
+ *
+ * Chaque mot de la requête doit être un mot ou un début de mot (2 caractères
+ * au moins) d'un champ indexé (nom, marque, description, sous-catégorie,
+ * catégorie), accents ignorés ; une sous-chaîne au milieu d'un mot ne
+ * correspond pas. Un mot entier du nom est mieux classé qu'un début de mot.
+ */
+export function searchProductIds(
+  index: SearchIndex,
+  query: string,
+  limit: number = 12
+): string[] {
+  const scores = new Map<number, number>();
+
+  tokenizeSearchQuery(query).forEach(word => {
+    const termIndex = findTerm(index.terms, word);
+    if (termIndex === -1) return;
+
+    index.postings[termIndex].forEach(posting => {
+      const position = posting >> FIELD_BITS;
+      let score = scores.get(position) || 0;
+      FIELD_WEIGHTS.forEach(([mask, weight]) => {
+        if (posting & mask) score += weight;
+      });
+      scores.set(position, score);
+    });
+  });
+
+  return Array.from(scores.entries())
+    .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+    .slice(0, limit)
+    .map(([position]) => index.ids[position]);
+}
@@ -11,6 +11,7 @@ export interface Product {
   price: number;
   originalPrice?: number;
   image: string;
+  imageSrcSet?: Record<string, string>; // format (webp, avif) -> srcset des déclinaisons
   images?: string[];
   category: string;
   subCategory?: string;
@@ -27,6 +28,49 @@ export interface Product {
   volumes?: ProductVolume[]; // Volumes disponibles pour les parfums
 }
 
+// Index précalculés par generate_products.py (--indexes)
+export interface ProductIndexes {
+  byId: Record<string, number>; // id -> position dans le tableau products
+  byCategory: Record<string, string[]>;
+  byBrand: Record<string, string[]>;
+  bySubCategory: Record<string, string[]>;
+  bestSellers: string[];
+}
+
+// Recommandations précalculées par generate_products.py (--recommendations)
+export interface RecommendationTable {
+  similar: Record<string, string[]>;
+  complementary: Record<string, string[]>;
+}
+
+// Index inversé de recherche généré par generate_products.py (--search-index)
+export interface SearchIndex {
+  ids: string[];
+  terms: string[]; // triés
+  postings: number[][]; // (position << 6) | masque des champs, par terme
+}
+
+// Instantané colonnaire généré par generate_products.py (--format snapshot)
+export interface CatalogSnapshot {
+  version: number;
+  count: number;
+  longDescriptionSuffix: string;
+  strings: string[]; // catégories, sous-catégories et marques dédoublonnées
+  columns: {
+    id: number[];
+    name: string[];
+    description: string[];
+    price: number[];
+    image: string[]; // fichiers de /image-products, résolus à la génération
+    category: number[]; // indices dans strings
+    subCategory: number[];
+    brand: number[];
+    rating: number[];
+    reviewsCount: number[];
+    isBestSeller: number[]; // 0 ou 1
+  };
+}
+
 export interface CartItem extends Product {
   quantity: number;
   selectedVolume?: string; // Volume sélectionné pour les parfums